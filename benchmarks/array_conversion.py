@@ -0,0 +1,47 @@
+# Compares conversions of .NET arrays to Python objects with Python.NET's marshalling.
+
+import time
+
+import pyrenode3
+
+# .NET namespaces can be imported once the runtime is loaded
+pyrenode3.ensure_loaded()
+
+from System import Array, Byte, UInt64  # noqa: E402
+
+from pyrenode3.conversion import as_memoryview, as_numpy, to_array  # noqa: E402
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+SIZES = (1 << 10, 1 << 20, 16 << 20)
+
+
+def measure(name, f, value, size):
+    start = time.perf_counter()
+    f(value)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<32} {elapsed * 1e3:>10.2f} ms {size / 2**20 / elapsed:>10.1f} MiB/s")
+
+
+for size in SIZES:
+    print(f"{size} bytes:")
+    array = Array.CreateInstance(Byte, size)
+    words = Array.CreateInstance(UInt64, size // 8)
+
+    measure("bytes(byte[])", bytes, array, size)
+    measure("list(ulong[])", list, words, size)
+    measure("as_memoryview(byte[]).tobytes()", lambda x: as_memoryview(x).tobytes(), array, size)
+    measure("as_memoryview(ulong[]).tolist()", lambda x: as_memoryview(x).tolist(), words, size)
+    if np is not None:
+        measure("as_numpy(ulong[])", as_numpy, words, size)
+        measure("as_numpy(ulong[]).copy()", lambda x: as_numpy(x).copy(), words, size)
+
+    data = bytes(size)
+    measure("Array[Byte](bytes)", Array[Byte], data, size)
+    measure("to_array(bytes)", to_array, data, size)
+    if np is not None:
+        values = np.zeros(size // 8, dtype=np.uint64)
+        measure("to_array(numpy.ndarray)", to_array, values, size)
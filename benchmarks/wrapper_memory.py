@@ -0,0 +1,32 @@
+# Measures memory and time needed to wrap many peripherals.
+# Peripherals are wrapped twice: the second pass should reuse wrappers from the first one.
+
+import sys
+import time
+import tracemalloc
+
+from pyrenode3.wrappers import Emulation, Peripheral
+
+COUNT = 10_000
+
+e = Emulation()
+mach = e.add_mach("bench")
+platform = (f"mem{i}: Memory.ArrayMemory @ sysbus {0x10000000 + i * 0x100:#x} {{ size: 0x100 }}" for i in range(COUNT))
+mach.LoadPlatformDescriptionFromString("\n".join(platform))
+peripherals = list(mach.internal.GetChildrenPeripherals(mach.sysbus.internal))
+print(f"{len(peripherals)} peripherals on sysbus")
+
+tracemalloc.start()
+for i in range(2):
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    wrapped = [Peripheral(p) for p in peripherals]
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    print(
+        f"pass {i}: {elapsed * 1e3:.1f} ms, {allocated / 2**20:.2f} MiB allocated, "
+        f"{allocated / len(wrapped):.0f} B per peripheral"
+    )
+
+print(f"size of a single wrapper: {sys.getsizeof(wrapped[0])} B")
+print(f"same wrapper returned for the same peripheral: {Peripheral(peripherals[0]) is wrapped[0]}")
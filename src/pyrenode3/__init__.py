@@ -1,23 +1,41 @@
 import importlib
+import importlib.abc
 import logging
+import pathlib
+import sys
 import threading
 
 from pyrenode3.loader import RenodeLoader
+from pyrenode3.profiling import StartupProfiler
 from pyrenode3 import env
 
 
-if not env.pyrenode_skip_load:
+# Top-level modules which can't be imported before the runtime is loaded
+_RUNTIME_MODULES = ("clr", "System", "Microsoft", "Mono", "Python", "Antmicro")
+
+
+# Whether Renode and the wrappers are loaded
+class _State:
+    loaded = False
+
+
+def _load_renode():
     runtime = env.pyrenode_runtime
 
     if runtime not in ["mono", "coreclr"]:
         raise ImportError(f"Runtime {runtime!r} not supported")
 
-    if sum(map(bool, (env.pyrenode_pkg, env.pyrenode_build_dir, env.pyrenode_bin))) > 1:
-        raise ImportError(
-            f"Multiple of {env.PYRENODE_PKG}, {env.PYRENODE_BUILD_DIR}, {env.PYRENODE_BIN} are set. Please unset all but one of them."
+    if sum(map(bool, (env.pyrenode_pkg, env.pyrenode_build_dir, env.pyrenode_bin, env.pyrenode_manifest))) > 1:
+        msg = (
+            f"Multiple of {env.PYRENODE_PKG}, {env.PYRENODE_BUILD_DIR}, {env.PYRENODE_BIN}, {env.PYRENODE_MANIFEST} "
+            f"are set. Please unset all but one of them."
         )
+        raise ImportError(msg)
 
-    if env.pyrenode_pkg:
+    if env.pyrenode_manifest:
+        RenodeLoader.from_manifest(env.pyrenode_manifest)
+
+    elif env.pyrenode_pkg:
         if runtime == "mono":
             RenodeLoader.from_mono_arch_pkg(env.pyrenode_pkg)
         elif runtime == "coreclr":
@@ -46,20 +64,92 @@ if not env.pyrenode_skip_load:
             f"   - set {env.PYRENODE_PKG} to the location of the Renode package\n"
             f"   - set {env.PYRENODE_BUILD_DIR} to the location of the Renode build directory\n"
             f"   - set {env.PYRENODE_BIN} to the location of the Renode portable binary\n"
+            f"   - set {env.PYRENODE_MANIFEST} to the location of a manifest created with `pyrenode3 prepare`\n"
         )
         raise ImportError(msg)
 
-    from System.Threading import Thread
-    Thread.CurrentThread.Name = threading.current_thread().name
 
-    # this prevents circular imports
-    importlib.import_module("pyrenode3.wrappers")
+def ensure_loaded():
+    """Load Renode and pyrenode3's wrappers, unless they are already loaded.
+
+    With ``PYRENODE_LAZY_IMPORT`` set, this happens on first use of pyrenode3 or .NET namespaces.
+    Call this function to pay the cost up front.
+    """
+    if _State.loaded:
+        return
+
+    # Importing the wrappers calls this function again
+    _State.loaded = True
+    try:
+        _load_renode()
+
+        from System.Threading import Thread
+        Thread.CurrentThread.Name = threading.current_thread().name
+
+        # this prevents circular imports
+        with StartupProfiler().phase("import pyrenode3.wrappers"):
+            importlib.import_module("pyrenode3.wrappers")
+
+        from pyrenode3.conversion import interface_to_class
+        from pyrenode3.rpath import RPath
+    except BaseException:
+        _State.loaded = False
+        raise
+
+    globals().update(RPath=RPath, interface_to_class=interface_to_class)
+
+
+class _RuntimeImportHook(importlib.abc.MetaPathFinder):
+    """A finder loading Renode when one of .NET namespaces is imported in the lazy mode."""
+
+    def find_spec(self, fullname, _path, _target=None):
+        # Returning None lets the clr module's finder import the namespace
+        if fullname.partition(".")[0] in _RUNTIME_MODULES:
+            sys.meta_path.remove(self)
+            try:
+                ensure_loaded()
+            except BaseException:
+                # Retry on the next import
+                sys.meta_path.insert(0, self)
+                raise
+
+
+def _running_cli() -> bool:
+    # The command line interface loads Renode only in commands which need it,
+    # so e.g. `pyrenode3 --profile-startup` doesn't load it before profiling a fresh process
+    if not sys.argv:
+        return False
+
+    if sys.argv[0] == "-m":
+        # The name of the module run with `python -m` is available from Python 3.10
+        argv = getattr(sys, "orig_argv", [])
+        return "-m" in argv and argv[argv.index("-m") + 1 :][:1] == [__name__]
+
+    return pathlib.Path(sys.argv[0]).stem == __name__
+
+
+def __getattr__(name):
+    if name in ("RPath", "interface_to_class", "wrappers"):
+        ensure_loaded()
+        if name in globals():
+            return globals()[name]
+        if name == "wrappers":
+            return importlib.import_module("pyrenode3.wrappers")
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
-    from pyrenode3.conversion import interface_to_class
-    from pyrenode3.rpath import RPath
+if env.pyrenode_skip_load:
+    pass
+elif env.pyrenode_lazy_import or _running_cli():
+    sys.meta_path.insert(0, _RuntimeImportHook())
+else:
+    ensure_loaded()
 
 __all__ = [
     "RPath",
+    "ensure_loaded",
     "interface_to_class",
     "wrappers",
 ]
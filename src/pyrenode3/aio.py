@@ -0,0 +1,187 @@
+import asyncio
+from contextlib import contextmanager, suppress
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from Antmicro.Renode.Time import TimeInterval
+
+from pyrenode3 import wrappers
+
+
+class Completion:
+    """An asyncio future which can be completed from any thread, e.g. from a .NET event handler."""
+
+    __slots__ = ("future", "loop")
+
+    def __init__(self, loop: "Optional[asyncio.AbstractEventLoop]" = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+    def set_result(self, result: Any = None) -> None:
+        self.__schedule(result, None)
+
+    def set_exception(self, exception: BaseException) -> None:
+        self.__schedule(None, exception)
+
+    def __schedule(self, result, exception) -> None:
+        # Renode's threads might complete the future after it's been awaited and its loop closed
+        if self.future.done() or self.loop.is_closed():
+            return
+
+        # The loop might be closed in the meantime
+        with suppress(RuntimeError):
+            self.loop.call_soon_threadsafe(self.__complete, result, exception)
+
+    def __complete(self, result, exception) -> None:
+        # The future might have been cancelled or completed by another event in the meantime
+        if self.future.done():
+            return
+
+        if exception is not None:
+            self.future.set_exception(exception)
+        else:
+            self.future.set_result(result)
+
+    def __await__(self):
+        return self.future.__await__()
+
+
+def to_interval(time: float):
+    """Convert `time` in seconds to ``TimeInterval``."""
+    return TimeInterval.FromMicroseconds(int(time * 1e6))
+
+
+def _retrieve_exception(task: "asyncio.Future") -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+def _discard(tasks: "Iterable[asyncio.Future]") -> None:
+    # Cancel tasks whose results aren't needed and retrieve their exceptions, so asyncio doesn't report them
+    for task in tasks:
+        task.add_done_callback(_retrieve_exception)
+        task.cancel()
+
+
+async def wait_any(awaitables: "Iterable[Awaitable]") -> "Tuple[int, Any]":
+    """Wait until the first of `awaitables` completes and cancel the remaining ones.
+
+    Returns
+    -------
+    Tuple[int, Any]
+        Index of the completed awaitable and its result
+    """
+    tasks = [asyncio.ensure_future(x) for x in awaitables]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        index = min(tasks.index(x) for x in done)
+        return index, tasks[index].result()
+    finally:
+        _discard(tasks)
+
+
+async def wait_all(awaitables: "Iterable[Awaitable]") -> "List[Any]":
+    """Wait until all `awaitables` complete; if any of them fails, the remaining ones are cancelled.
+
+    Returns
+    -------
+    List[Any]
+        Results in the order of `awaitables`
+    """
+    tasks = [asyncio.ensure_future(x) for x in awaitables]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        _discard(tasks)
+
+
+class AsyncEmulation:
+    """asyncio interface controlling :class:`Emulation <pyrenode3.wrappers.Emulation>`.
+
+    Waiting doesn't block the event loop or use any threads: futures are completed
+    by actions scheduled in virtual time and by emulation's events.
+    """
+
+    def __init__(self, emulation: "Optional[wrappers.Emulation]" = None):
+        self.emulation = emulation or wrappers.Emulation()
+
+    @property
+    def is_running(self) -> bool:
+        return any(not m.internal.IsPaused for m in self.emulation)
+
+    async def start(self) -> None:
+        """Start all machines."""
+        self.emulation.internal.StartAll()
+
+    async def pause(self) -> None:
+        """Pause the emulation at the next synchronization point and wait until it's paused."""
+        if not self.is_running:
+            return
+
+        await self.__pause_after(0)
+
+    async def run_for(self, time: float) -> None:
+        """Run the emulation for `time` virtual seconds and wait until it's paused."""
+        await self.__pause_after(time, start=True)
+
+    async def call(self, machine: "wrappers.Machine", function: "Callable[..., Any]", *args) -> Any:
+        """Call `function` on the emulation thread of `machine`, at the next synchronization point.
+
+        The function is called only while the emulation is running.
+
+        Returns
+        -------
+        Any
+            Result of the function
+        """
+        completion = Completion()
+
+        def action(_):
+            # The caller might have stopped waiting, e.g. on a timeout
+            if completion.future.done():
+                return
+
+            try:
+                completion.set_result(function(*args))
+            except BaseException as e:
+                completion.set_exception(e)
+
+        machine.internal.ScheduleAction(to_interval(0), action)
+        return await completion
+
+    async def wait_paused(self) -> None:
+        """Wait until all machines are paused."""
+        with self.__on_paused() as paused:
+            # Machines might have been paused before the handler was added
+            if self.is_running:
+                await paused
+
+    async def __pause_after(self, time: float, *, start: bool = False) -> None:
+        machine = next(iter(self.emulation), None)
+        if machine is None:
+            msg = "The emulation has no machines."
+            raise RuntimeError(msg)
+
+        def pause(_):
+            machine.internal.PauseAndRequestEmulationPause()
+
+        # Subscribe before anything is scheduled, so the pause can't be missed
+        with self.__on_paused() as paused:
+            machine.internal.ScheduleAction(to_interval(time), pause)
+            if start:
+                self.emulation.internal.StartAll()
+            await paused
+
+    @contextmanager
+    def __on_paused(self) -> "Iterator[Completion]":
+        completion = Completion()
+
+        def on_state_changed(_, args):
+            if str(args.CurrentState) == "Paused" and not self.is_running:
+                completion.set_result()
+
+        emulation = self.emulation.internal
+        emulation.MachineStateChanged += on_state_changed
+        try:
+            yield completion
+        finally:
+            emulation.MachineStateChanged -= on_state_changed
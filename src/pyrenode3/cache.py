@@ -0,0 +1,258 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import platform
+import shutil
+import tarfile
+import tempfile
+from typing import Iterable, Optional, Union
+
+from pyrenode3 import env
+
+try:
+    import fcntl
+except ImportError:
+    # On Windows files in use can't be removed, so entries used by other processes aren't evicted anyway
+    fcntl = None
+
+DEFAULT_CACHE_SIZE = "2G"
+
+# Name of the file, placed in every extracted package, that marks the extraction as complete
+METADATA_FILE = ".pyrenode3.json"
+
+_SIZE_SUFFIXES = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+# Lock files of packages used by this process: entry -> open file holding a shared lock
+_leases = {}
+
+
+def cache_dir() -> "pathlib.Path":
+    """Get the root directory of pyrenode3's on-disk cache."""
+    if env.pyrenode_cache_dir:
+        return pathlib.Path(env.pyrenode_cache_dir).expanduser()
+
+    if platform.system() == "Windows" and "LOCALAPPDATA" in os.environ:
+        base = pathlib.Path(os.environ["LOCALAPPDATA"])
+    elif "XDG_CACHE_HOME" in os.environ:
+        base = pathlib.Path(os.environ["XDG_CACHE_HOME"])
+    else:
+        base = pathlib.Path.home() / ".cache"
+
+    return base / "pyrenode3"
+
+
+def parse_size(value: "Union[str, int]") -> int:
+    """Convert a size like ``512M`` or ``2G`` to a number of bytes."""
+    if isinstance(value, int):
+        return value
+
+    value = value.strip().upper().rstrip("B")
+    suffix = value[-1:] if value[-1:] in _SIZE_SUFFIXES else ""
+    try:
+        return int(float(value[: len(value) - len(suffix)]) * _SIZE_SUFFIXES[suffix])
+    except ValueError as e:
+        msg = f"Invalid size {value!r} in {env.PYRENODE_CACHE_SIZE}"
+        raise ValueError(msg) from e
+
+
+def atomic_write(path: "pathlib.Path", data: "Union[str, bytes]") -> None:
+    """Write a file so that concurrent readers see either nothing or the whole content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        pathlib.Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def stamp(path: "pathlib.Path") -> str:
+    """Get a key identifying a file by its path, size and modification time."""
+    path = pathlib.Path(path).resolve()
+    st = path.stat()
+    key = f"{path}\0{st.st_size}\0{st.st_mtime_ns}".encode()
+    return hashlib.sha1(key).hexdigest()  # noqa: S324
+
+
+def file_digest(path: "pathlib.Path") -> str:
+    """Get the SHA-256 digest of a file's content.
+
+    Digests are memoized on disk by the file's path, size and modification time,
+    so an unchanged file is hashed only once.
+    """
+    memo = cache_dir() / "digests" / stamp(path)
+
+    try:
+        return memo.read_text().strip()
+    except OSError:
+        pass
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+
+    digest = h.hexdigest()
+    atomic_write(memo, digest)
+    return digest
+
+
+def _tree_size(path: "pathlib.Path") -> int:
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _lock_file(entry: "pathlib.Path") -> "pathlib.Path":
+    return entry.with_name(f".{entry.name}.lock")
+
+
+def lease(path: "pathlib.Path") -> None:
+    """Protect an extracted package from eviction by other processes until this process exits.
+
+    `path` can be the package's directory or any path inside it; paths outside of the package cache are ignored.
+    """
+    if fcntl is None:
+        return
+
+    path = pathlib.Path(path).resolve()
+    packages = (cache_dir() / "packages").resolve()
+    entry = next((p for p in [path, *path.parents] if p.parent == packages), None)
+    if entry is None or entry in _leases:
+        return
+
+    f = open(_lock_file(entry), "a")
+    # Blocks while another process is removing the entry
+    fcntl.flock(f, fcntl.LOCK_SH)
+    _leases[entry] = f
+
+
+def _package_entries() -> "Iterable[pathlib.Path]":
+    packages = cache_dir() / "packages"
+    if not packages.exists():
+        return []
+
+    # Dot-prefixed directories are packages being extracted or removed
+    return [p for p in packages.iterdir() if not p.name.startswith(".") and p.is_dir() and (p / METADATA_FILE).exists()]
+
+
+def evict(limit: int, keep: "Iterable[pathlib.Path]" = ()) -> None:
+    """Remove the least recently used extracted packages until the cache fits in `limit` bytes.
+
+    Packages leased by any process (see :func:`lease`) are skipped.
+
+    Parameters
+    ----------
+    limit : int
+        maximum total size of extracted packages in bytes; ``0`` disables eviction
+
+    keep
+        entries that must not be removed
+    """
+    if limit <= 0:
+        return
+
+    keep = {p.resolve() for p in keep}
+    entries = []
+    for entry in _package_entries():
+        try:
+            size = json.loads((entry / METADATA_FILE).read_text())["size"]
+            entries.append((entry.stat().st_mtime, size, entry))
+        except (OSError, ValueError, KeyError):
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries, key=lambda x: x[0]):
+        if total <= limit:
+            break
+        if entry.resolve() in keep:
+            continue
+
+        if _remove(entry):
+            total -= size
+
+
+def _remove(entry: "pathlib.Path") -> bool:
+    lock = None
+    if fcntl is not None:
+        try:
+            lock = open(_lock_file(entry), "a")
+        except OSError:
+            return False
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            # The package is used by a process, including this one
+            lock.close()
+            return False
+
+    try:
+        logging.info(f"Removing {entry} from the package cache.")
+        # Rename first, so no other process picks up a partially removed entry
+        trash = entry.with_name(f".trash-{entry.name}-{os.getpid()}")
+        try:
+            entry.rename(trash)
+        except OSError:
+            return False
+        shutil.rmtree(trash, ignore_errors=True)
+        return True
+    finally:
+        if lock is not None:
+            lock.close()
+
+
+def extract_package(path: "Union[str, pathlib.Path]", limit: "Optional[int]" = None) -> "pathlib.Path":
+    """Extract a Renode package into the cache and return the directory with its content.
+
+    Packages are stored under their content digest, so each of them is extracted only once.
+    Extraction happens in a temporary directory which is atomically renamed to its final
+    location, which makes it safe to call from many processes at the same time. The returned
+    directory is leased (see :func:`lease`), so other processes don't evict it while it's used.
+    """
+    path = pathlib.Path(path)
+    packages = cache_dir() / "packages"
+    target = packages / file_digest(path)
+
+    packages.mkdir(parents=True, exist_ok=True)
+    lease(target)
+
+    if not (target / METADATA_FILE).exists():
+        temp = pathlib.Path(tempfile.mkdtemp(dir=packages, prefix=f".{target.name}."))
+        try:
+            logging.info(f"Extracting {path} to {target}.")
+            with tarfile.open(path, "r") as f:
+                f.extractall(temp)
+
+            metadata = {"source": str(path.resolve()), "size": _tree_size(temp)}
+
+            try:
+                temp.rename(target)
+            except OSError:
+                # Another process has extracted the same package in the meantime
+                if not target.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(temp, ignore_errors=True)
+
+        # The metadata marks the extraction as complete, so it's written once the package is in place;
+        # the process which lost the race writes it too in case the winner hasn't done it yet
+        if not (target / METADATA_FILE).exists():
+            atomic_write(target / METADATA_FILE, json.dumps(metadata))
+
+        if limit is None:
+            limit = parse_size(env.pyrenode_cache_size or DEFAULT_CACHE_SIZE)
+        evict(limit, keep=[target])
+
+    # Mark the entry as recently used
+    os.utime(target)
+
+    return target
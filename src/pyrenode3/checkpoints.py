@@ -0,0 +1,314 @@
+import hashlib
+import json
+import logging
+import mmap
+import pathlib
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from pyrenode3 import cache
+
+if TYPE_CHECKING:
+    from pyrenode3 import wrappers
+    from pyrenode3.wrappers.machine import MemoryRegion
+
+DEFAULT_PAGE_SIZE = 4096
+
+# Index of a chain: page size, memory regions and number of checkpoints
+INDEX_FILE = "chain.json"
+
+# Size of blocks read from memories which don't expose their host memory
+_CHUNK_SIZE = 16 << 20
+
+_DIGEST_SIZE = 16
+
+
+def _page_digest(page) -> bytes:
+    return hashlib.blake2b(page, digest_size=_DIGEST_SIZE).digest()
+
+
+class CheckpointChain:
+    """Incremental checkpoints of a machine, stored on disk as a chain of deltas.
+
+    The first checkpoint holds all pages of the machine's memory regions; each subsequent one holds
+    only the pages whose content changed since the previous checkpoint, which are found by comparing
+    digests of pages. Registers of all CPUs are stored with every checkpoint. State of other
+    peripherals isn't captured, so restoring a checkpoint logs a warning that they keep their
+    current state; use emulation snapshots (see :mod:`pyrenode3.snapshots`) to restore them as well.
+
+    Digests of pages as of the last checkpoint are stored with the chain, so it can be reopened
+    by another process, e.g. to restore a checkpoint in a new emulation of the same machine.
+
+    Checkpoints should be created and restored while the emulation is paused.
+    """
+
+    def __init__(
+        self,
+        machine: "wrappers.Machine",
+        directory: "Union[str, pathlib.Path]",
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        """Open the chain of checkpoints of `machine` stored in `directory` or start a new one there.
+
+        Parameters
+        ----------
+        machine : wrappers.Machine
+            machine to checkpoint
+
+        directory : Union[str, pathlib.Path]
+            directory to store checkpoints in
+
+        page_size : int
+            size of pages memory is compared in, in bytes
+
+        Raises
+        ------
+        ValueError
+            If the chain stored in `directory` uses another page size or other memory regions
+        """
+        self.machine = machine
+        self.directory = pathlib.Path(directory)
+        self.page_size = page_size
+
+        # Memories registered at many addresses are stored once
+        self.__regions = []
+        for region in machine.memory_regions():
+            if all(r.peripheral is not region.peripheral for r in self.__regions):
+                self.__regions.append(region)
+        # Digests of pages as of the last checkpoint: region address -> page -> digest
+        self.__digests = {}
+        self.__count = 0
+        # Whether restoring has warned about peripherals which aren't restored
+        self.__warned = False
+
+        index = self.directory / INDEX_FILE
+        if index.exists():
+            self.__open(json.loads(index.read_text()))
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def checkpoint(self) -> int:
+        """Store the current state of the machine.
+
+        Returns
+        -------
+        int
+            Index of the checkpoint
+        """
+        index = self.__count
+        name = self.__name(index)
+
+        regions = {}
+        digests = {}
+        with open(self.directory / f"{name}.pages", "wb") as f:
+            for region in self.__regions:
+                previous = self.__digests.get(region.address, {})
+                current = digests[region.address] = {}
+                pages = []
+                for page_no, page in self.__pages(region):
+                    digest = current[page_no] = _page_digest(page)
+                    if previous.get(page_no) != digest:
+                        pages.append([page_no, f.tell()])
+                        f.write(page)
+
+                regions[str(region.address)] = pages
+
+        registers_file = f"{name}.npy"
+        self.__save_registers(self.directory / registers_file)
+
+        metadata = {"page_size": self.page_size, "registers": registers_file, "regions": regions}
+        (self.directory / f"{name}.json").write_text(json.dumps(metadata))
+
+        self.__digests = digests
+        self.__commit(index)
+        self.__count += 1
+        return index
+
+    def restore(self, index: int) -> None:
+        """Bring the machine back to the state of checkpoint `index`.
+
+        Checkpoints created after it are removed, so a following :meth:`checkpoint` continues
+        the chain from the restored state. Peripherals other than memories and CPUs aren't restored.
+        """
+        if not 0 <= index < self.__count:
+            msg = f"There is no checkpoint {index}, the chain has {self.__count} checkpoints."
+            raise IndexError(msg)
+
+        if not self.__warned:
+            self.__warned = True
+            logging.warning(
+                f"Checkpoints in {self.directory} restore only memory and CPU registers, "
+                f"other peripherals of the machine keep their current state."
+            )
+
+        # Pages changed since checkpoint `index`: those stored by later checkpoints
+        # and those written since the last checkpoint
+        dirty = set()
+        for i in range(index + 1, self.__count):
+            for address, pages in self.__metadata(i)["regions"].items():
+                dirty.update((int(address), page_no) for page_no, _ in pages)
+
+        current = {}
+        for region in self.__regions:
+            digests = current[region.address] = {}
+            head = self.__digests[region.address]
+            for page_no, page in self.__pages(region):
+                digests[page_no] = _page_digest(page)
+                if head.get(page_no) != digests[page_no]:
+                    dirty.add((region.address, page_no))
+
+        # Versions of dirty pages as of checkpoint `index`: (region address, page) -> (checkpoint, offset)
+        versions = {}
+        for i in range(index + 1):
+            for address, pages in self.__metadata(i)["regions"].items():
+                for page_no, offset in pages:
+                    if (int(address), page_no) in dirty:
+                        versions[int(address), page_no] = i, offset
+
+        sizes = {region.address: region.size for region in self.__regions}
+        files = {}
+        try:
+            for (address, page_no), (i, offset), count in self.__runs(versions):
+                if i not in files:
+                    with open(self.directory / f"{self.__name(i)}.pages", "rb") as f:
+                        files[i] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+                # The last page of a region might be shorter
+                start = page_no * self.page_size
+                length = min(count * self.page_size, sizes[address] - start)
+                data = files[i][offset : offset + length]
+                self.machine.write_memory(address + start, data)
+
+                view = memoryview(data)
+                for n in range(count):
+                    current[address][page_no + n] = _page_digest(view[n * self.page_size : (n + 1) * self.page_size])
+        finally:
+            for m in files.values():
+                m.close()
+
+        self.__load_registers(self.directory / f"{self.__name(index)}.npy")
+
+        self.__digests = current
+        self.__commit(index)
+        for i in range(index + 1, self.__count):
+            for f in self.directory.glob(f"{self.__name(i)}.*"):
+                f.unlink()
+        self.__count = index + 1
+
+    def __open(self, index: dict) -> None:
+        if index["page_size"] != self.page_size:
+            msg = f"Checkpoints in {self.directory} use pages of {index['page_size']} bytes, not {self.page_size}."
+            raise ValueError(msg)
+
+        if index["regions"] != [[region.address, region.size] for region in self.__regions]:
+            msg = f"Checkpoints in {self.directory} were created for other memory regions."
+            raise ValueError(msg)
+
+        self.__count = index["count"]
+        if self.__count:
+            self.__digests = self.__load_digests(self.__count - 1)
+
+    def __commit(self, head: int) -> None:
+        # Digests are written before the index refers to them, so the chain on disk is always consistent
+        name = f"{self.__name(head)}.digests"
+        data = b"".join(
+            self.__digests[region.address][page_no]
+            for region in self.__regions
+            for page_no in range(self.__page_count(region))
+        )
+        cache.atomic_write(self.directory / name, data)
+
+        index = {
+            "page_size": self.page_size,
+            "regions": [[region.address, region.size] for region in self.__regions],
+            "count": head + 1,
+        }
+        cache.atomic_write(self.directory / INDEX_FILE, json.dumps(index))
+
+        # Only digests of the last checkpoint are needed
+        for f in self.directory.glob("checkpoint-*.digests"):
+            if f.name != name:
+                f.unlink()
+
+    def __load_digests(self, head: int) -> "Dict[int, Dict[int, bytes]]":
+        data = (self.directory / f"{self.__name(head)}.digests").read_bytes()
+
+        digests = {}
+        offset = 0
+        for region in self.__regions:
+            pages = digests[region.address] = {}
+            for page_no in range(self.__page_count(region)):
+                pages[page_no] = data[offset : offset + _DIGEST_SIZE]
+                offset += _DIGEST_SIZE
+
+        return digests
+
+    def __runs(self, versions: "Dict[Tuple[int, int], Tuple[int, int]]") -> "Iterator[Tuple[Any, Any, int]]":
+        # Merge consecutive pages stored one after another in the same file, so they are written at once
+        run = None
+        for (address, page_no), (i, offset) in sorted(versions.items()):
+            if run is not None:
+                (run_address, run_page), (run_i, run_offset), count = run
+                if (
+                    (address, i) == (run_address, run_i)
+                    and page_no == run_page + count
+                    and offset == run_offset + count * self.page_size
+                ):
+                    run = run[0], run[1], count + 1
+                    continue
+                yield run
+            run = (address, page_no), (i, offset), 1
+
+        if run is not None:
+            yield run
+
+    def __metadata(self, index: int) -> dict:
+        return json.loads((self.directory / f"{self.__name(index)}.json").read_text())
+
+    def __name(self, index: int) -> str:
+        return f"checkpoint-{index:06}"
+
+    def __page_count(self, region: "MemoryRegion") -> int:
+        return -(-region.size // self.page_size)
+
+    def __pages(self, region: "MemoryRegion") -> "Iterator[Tuple[int, memoryview]]":
+        for offset, chunk in self.__chunks(region):
+            for start in range(0, len(chunk), self.page_size):
+                yield (offset + start) // self.page_size, chunk[start : start + self.page_size]
+
+    def __chunks(self, region: "MemoryRegion") -> "Iterator[Tuple[int, memoryview]]":
+        views: Optional[List[Tuple[int, memoryview]]]
+        try:
+            views = self.machine.memory_view(region)
+        except TypeError:
+            views = None
+
+        # Compare host memory directly if it can be split into pages; only the region's last page can be shorter
+        if views and all(
+            offset % self.page_size == 0 and (len(v) % self.page_size == 0 or offset + len(v) == region.size)
+            for offset, v in views
+        ):
+            yield from views
+            return
+
+        for offset in range(0, region.size, _CHUNK_SIZE):
+            length = min(_CHUNK_SIZE, region.size - offset)
+            yield offset, memoryview(self.machine.read_memory(region.address + offset, length))
+
+    def __save_registers(self, path: "pathlib.Path") -> None:
+        try:
+            import numpy as np
+        except ModuleNotFoundError as e:
+            raise ImportError from e
+
+        np.save(path, self.machine.register_snapshot())
+
+    def __load_registers(self, path: "pathlib.Path") -> None:
+        try:
+            import numpy as np
+        except ModuleNotFoundError as e:
+            raise ImportError from e
+
+        self.machine.set_registers(np.load(path))
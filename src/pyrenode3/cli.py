@@ -1,12 +1,23 @@
-try:
-    import bpython
-except ModuleNotFoundError as e:
-    raise ImportError from e
+import argparse
+import os
+import subprocess
+import sys
 
-import pyrenode3
+from pyrenode3 import env
+from pyrenode3.loader import RenodeLoader, write_manifest
+from pyrenode3.profiling import StartupProfiler
 
 
-def main():
+def shell():
+    try:
+        import bpython
+    except ModuleNotFoundError as e:
+        raise ImportError from e
+
+    import pyrenode3
+
+    pyrenode3.ensure_loaded()
+
     local = {
         "e": pyrenode3.wrappers.Emulation(),
         "m": pyrenode3.wrappers.Monitor(),
@@ -18,3 +29,90 @@ def main():
         local[wrapper_name] = getattr(pyrenode3.wrappers, wrapper_name)
 
     bpython.embed(local)
+
+
+def prepare(output: str) -> int:
+    """Write a manifest describing the Renode selected with the ``PYRENODE_*`` variables.
+
+    Setting ``PYRENODE_MANIFEST`` to the written file makes subsequent imports skip Renode discovery.
+    """
+    import pyrenode3
+
+    try:
+        pyrenode3.ensure_loaded()
+    except ImportError as e:
+        print(f"Renode can't be loaded, cannot create a manifest: {e}", file=sys.stderr)
+        return 1
+
+    loader = RenodeLoader()
+
+    if loader.manifest.get("temporary"):
+        print("Renode was extracted to a temporary directory, unset PYRENODE_NO_CACHE.", file=sys.stderr)
+        return 1
+
+    write_manifest(loader.manifest, output)
+    print(f"Manifest written to {output}. Set PYRENODE_MANIFEST={output} to use it.")
+    return 0
+
+
+def stubs(output, force) -> int:
+    """Generate typed stubs of proxies of Renode's classes."""
+    from pyrenode3.stubs import STUBS_PACKAGE, generate_stubs
+
+    path = generate_stubs(output, force=force)
+    print(f"Stubs of pyrenode3.proxies are in {path / STUBS_PACKAGE}.")
+    return 0
+
+
+def profile_startup(argv) -> int:
+    """Print how long each phase of pyrenode3's startup took."""
+    profiler = StartupProfiler()
+    if not profiler.enabled:
+        # Profiling has to be enabled before pyrenode3 is imported, so measure a fresh interpreter
+        environ = {**os.environ, env.PYRENODE_PROFILE_STARTUP: "1"}
+        return subprocess.call([sys.executable, "-m", "pyrenode3", *argv], env=environ)  # noqa: S603
+
+    import pyrenode3
+
+    pyrenode3.ensure_loaded()
+    with profiler.phase("Emulation"):
+        pyrenode3.wrappers.Emulation()
+    pyrenode3.wrappers.Monitor()
+
+    print(profiler.report())
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="pyrenode3", description="Python interface for Renode.")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="measure startup phases (import, runtime and assemblies loading, emulator initialization) and exit",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    prepare_parser = commands.add_parser(
+        "prepare",
+        help="discover Renode selected with PYRENODE_* variables once and write a startup manifest",
+    )
+    prepare_parser.add_argument("-o", "--output", default="pyrenode3-manifest.json", help="manifest location")
+
+    stubs_parser = commands.add_parser("stubs", help="generate typed stubs of proxies of Renode's classes")
+    stubs_parser.add_argument("-o", "--output", help="output directory (default: site-packages)")
+    stubs_parser.add_argument("--force", action="store_true", help="regenerate up-to-date stubs")
+
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        sys.exit(profile_startup(argv))
+
+    if args.command == "prepare":
+        sys.exit(prepare(args.output))
+
+    if args.command == "stubs":
+        sys.exit(stubs(args.output, args.force))
+
+    shell()
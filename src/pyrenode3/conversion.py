@@ -1,16 +1,231 @@
-from System.Collections.Generic import List
+import ctypes
+from typing import TYPE_CHECKING, Any, List, Optional, Union
+
+import clr
+from System import Array, Object, Type
+from System.Collections import Generic
+from System.Runtime.InteropServices import GCHandle, GCHandleType
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Closed generic lists used for conversion: .NET type -> List[type]
+_lists = {}
+
+# ctypes types of .NET array elements: .NET type name -> ctypes type
+_CTYPES = {
+    "System.Boolean": ctypes.c_bool,
+    "System.Byte": ctypes.c_uint8,
+    "System.SByte": ctypes.c_int8,
+    "System.Int16": ctypes.c_int16,
+    "System.UInt16": ctypes.c_uint16,
+    "System.Int32": ctypes.c_int32,
+    "System.UInt32": ctypes.c_uint32,
+    "System.Int64": ctypes.c_int64,
+    "System.UInt64": ctypes.c_uint64,
+    "System.Single": ctypes.c_float,
+    "System.Double": ctypes.c_double,
+}
+
+# .NET types of integers: (size, signed) -> .NET type name
+_INTEGERS = {
+    (1, True): "System.SByte",
+    (1, False): "System.Byte",
+    (2, True): "System.Int16",
+    (2, False): "System.UInt16",
+    (4, True): "System.Int32",
+    (4, False): "System.UInt32",
+    (8, True): "System.Int64",
+    (8, False): "System.UInt64",
+}
+
+# .NET types of buffer elements other than integers: struct format character -> .NET type name
+_NET_TYPES = {
+    "?": "System.Boolean",
+    "f": "System.Single",
+    "d": "System.Double",
+}
+
+# struct format characters of integers, signed ones are lowercase. Their sizes depend on the platform
+# and on the byte order character (e.g. NumPy's int64 is 'l' on Linux and 'q' on Windows), so they
+# are mapped to .NET types by the buffer's item size.
+_INTEGER_CODES = "bBhHiIlLqQnN"
 
 
 def interface_to_class(obj):
     """Change object's type to its real class."""
+    # Python.NET exposes the real object of anything returned as an interface
+    try:
+        return obj.__implementation__
+    except AttributeError:
+        pass
+
     # find obj's real class
     kls = obj.GetType()
 
     # create a List of that class
-    lst = List[kls]()
+    lst = _lists.get(kls)
+    if lst is None:
+        lst = _lists[kls] = Generic.List[kls]
+    lst = lst()
 
     # add obj to the list and convert it to the real class
     lst.Add(obj)
 
     # extract and return
     return lst[0]
+
+
+def interfaces_to_classes(objs) -> "List[Any]":
+    """Change types of all objects of a .NET ``IEnumerable`` to their real classes.
+
+    The objects are copied to a list of ``Object`` in a single call; Python.NET provides
+    elements of such list with their real classes.
+    """
+    return list(Generic.List[Object](objs))
+
+
+class _PinnedArray:
+    """Keeps a .NET array pinned in memory until it's freed."""
+
+    __slots__ = ("__handle",)
+
+    def __init__(self, array):
+        self.__handle = GCHandle.Alloc(array, GCHandleType.Pinned)
+
+    @property
+    def address(self) -> int:
+        return self.__handle.AddrOfPinnedObject().ToInt64()
+
+    def __del__(self):
+        try:
+            if self.__handle.IsAllocated:
+                self.__handle.Free()
+        except Exception:  # noqa: S110
+            # The runtime is already shut down at interpreter exit
+            pass
+
+
+def _ctypes_view(array):
+    element = array.GetType().GetElementType().FullName
+    ctype = _CTYPES.get(element)
+    if ctype is None:
+        msg = f"Arrays of {element} can't be viewed as a buffer."
+        raise TypeError(msg)
+
+    pin = _PinnedArray(array)
+    view = (ctype * array.Length).from_address(pin.address)
+    # The view doesn't own its memory, so it has to keep the array pinned
+    view._pin = pin
+    return view
+
+
+def as_memoryview(array) -> "memoryview":
+    """Get a view of a .NET array of primitive values, without copying it.
+
+    The array is pinned for as long as the view (or any object created from it) exists.
+    Multidimensional arrays are viewed as flat ones.
+    """
+    view = _ctypes_view(array)
+    # ctypes reports formats with a byte order character (e.g. '<i'), which memoryview can't index
+    return memoryview(view).cast("B").cast(view._type_._type_)
+
+
+def copy_to(array, buffer) -> None:
+    """Copy content of a .NET array of primitive values to the beginning of a writable C-contiguous buffer.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is smaller than the array
+    """
+    source = as_memoryview(array).cast("B")
+    target = memoryview(buffer).cast("B")
+    if source.nbytes > target.nbytes:
+        msg = f"The buffer has {target.nbytes} bytes, {source.nbytes} are needed."
+        raise ValueError(msg)
+
+    target[: source.nbytes] = source
+
+
+def as_numpy(array) -> "np.ndarray":
+    """Get a NumPy array sharing memory with a .NET array of primitive values.
+
+    The .NET array is pinned for as long as the NumPy array exists.
+    """
+    try:
+        import numpy as np
+    except ModuleNotFoundError as e:
+        raise ImportError from e
+
+    view = _ctypes_view(array)
+    shape = tuple(array.GetLength(i) for i in range(array.Rank))
+    return np.frombuffer(view, dtype=view._type_).reshape(shape)
+
+
+def _element_type(view: "memoryview") -> "Optional[str]":
+    code = view.format.lstrip("@=<")
+    if len(code) == 1 and code in _INTEGER_CODES:
+        return _INTEGERS.get((view.itemsize, code.islower()))
+
+    return _NET_TYPES.get(code)
+
+
+def to_array(buffer, element_type: "Optional[Union[str, Any]]" = None):
+    """Copy any C-contiguous buffer (e.g. ``bytes``, ``memoryview`` or a NumPy array) to a new .NET array.
+
+    The content is copied with a single ``memmove``.
+
+    Parameters
+    ----------
+    buffer
+        object supporting the buffer protocol
+
+    element_type : Optional[Union[str, Any]]
+        .NET type (or its full name) of the array's elements; by default, it's based on the buffer's format
+
+    Returns
+    -------
+    Any
+        One-dimensional .NET array
+    """
+    view = memoryview(buffer)
+    if not view.c_contiguous:
+        msg = "Only C-contiguous buffers can be copied to .NET arrays."
+        raise ValueError(msg)
+
+    if element_type is None:
+        element_type = _element_type(view)
+        if element_type is None:
+            msg = f"Buffers of format {view.format!r} can't be converted to .NET arrays."
+            raise TypeError(msg)
+    if isinstance(element_type, str):
+        element_type = Type.GetType(element_type)
+    elif not isinstance(element_type, Type):
+        element_type = clr.GetClrType(element_type)
+
+    ctype = _CTYPES.get(element_type.FullName)
+    if ctype is None:
+        msg = f"Arrays of {element_type.FullName} can't be created from a buffer."
+        raise TypeError(msg)
+
+    itemsize = ctypes.sizeof(ctype)
+    if view.nbytes % itemsize:
+        msg = f"Size of the buffer isn't a multiple of the size of {element_type.FullName}."
+        raise ValueError(msg)
+
+    array = Array.CreateInstance(element_type, view.nbytes // itemsize)
+    if view.nbytes:
+        if isinstance(buffer, bytes):
+            source = buffer
+        elif not view.readonly:
+            source = (ctypes.c_char * view.nbytes).from_buffer(view)
+        else:
+            # ctypes can't get the address of other read-only buffers
+            source = view.tobytes()
+
+        pin = _PinnedArray(array)
+        ctypes.memmove(pin.address, source, view.nbytes)
+        del pin
+
+    return array
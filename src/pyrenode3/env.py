@@ -1,17 +1,33 @@
 import os
 
 # Env variable names
-PYRENODE_BIN          = "PYRENODE_BIN"
-PYRENODE_BUILD_DIR    = "PYRENODE_BUILD_DIR"
-PYRENODE_BUILD_OUTPUT = "PYRENODE_BUILD_OUTPUT"
-PYRENODE_PKG          = "PYRENODE_PKG"
-PYRENODE_RUNTIME      = "PYRENODE_RUNTIME"
-PYRENODE_SKIP_LOAD    = "PYRENODE_SKIP_LOAD"
+PYRENODE_BIN             = "PYRENODE_BIN"
+PYRENODE_BUILD_DIR       = "PYRENODE_BUILD_DIR"
+PYRENODE_BUILD_OUTPUT    = "PYRENODE_BUILD_OUTPUT"
+PYRENODE_CACHE_DIR       = "PYRENODE_CACHE_DIR"
+PYRENODE_CACHE_SIZE      = "PYRENODE_CACHE_SIZE"
+PYRENODE_LAZY_ASSEMBLIES = "PYRENODE_LAZY_ASSEMBLIES"
+PYRENODE_LAZY_IMPORT     = "PYRENODE_LAZY_IMPORT"
+PYRENODE_MANIFEST        = "PYRENODE_MANIFEST"
+PYRENODE_NO_CACHE        = "PYRENODE_NO_CACHE"
+PYRENODE_PKG             = "PYRENODE_PKG"
+PYRENODE_PROFILE_STARTUP = "PYRENODE_PROFILE_STARTUP"
+PYRENODE_PROXIES         = "PYRENODE_PROXIES"
+PYRENODE_RUNTIME         = "PYRENODE_RUNTIME"
+PYRENODE_SKIP_LOAD       = "PYRENODE_SKIP_LOAD"
 
 # Values of env variables
-pyrenode_bin          = os.environ.get(PYRENODE_BIN)
-pyrenode_build_dir    = os.environ.get(PYRENODE_BUILD_DIR)
-pyrenode_build_output = os.environ.get(PYRENODE_BUILD_OUTPUT)
-pyrenode_pkg          = os.environ.get(PYRENODE_PKG)
-pyrenode_runtime      = os.environ.get(PYRENODE_RUNTIME, "mono")
-pyrenode_skip_load    = os.environ.get(PYRENODE_SKIP_LOAD)
+pyrenode_bin             = os.environ.get(PYRENODE_BIN)
+pyrenode_build_dir       = os.environ.get(PYRENODE_BUILD_DIR)
+pyrenode_build_output    = os.environ.get(PYRENODE_BUILD_OUTPUT)
+pyrenode_cache_dir       = os.environ.get(PYRENODE_CACHE_DIR)
+pyrenode_cache_size      = os.environ.get(PYRENODE_CACHE_SIZE)
+pyrenode_lazy_assemblies = os.environ.get(PYRENODE_LAZY_ASSEMBLIES)
+pyrenode_lazy_import     = os.environ.get(PYRENODE_LAZY_IMPORT)
+pyrenode_manifest        = os.environ.get(PYRENODE_MANIFEST)
+pyrenode_no_cache        = os.environ.get(PYRENODE_NO_CACHE)
+pyrenode_pkg             = os.environ.get(PYRENODE_PKG)
+pyrenode_profile_startup = os.environ.get(PYRENODE_PROFILE_STARTUP)
+pyrenode_proxies         = os.environ.get(PYRENODE_PROXIES)
+pyrenode_runtime         = os.environ.get(PYRENODE_RUNTIME, "mono")
+pyrenode_skip_load       = os.environ.get(PYRENODE_SKIP_LOAD)
@@ -14,6 +14,7 @@ from Antmicro.Renode.UI import (
     XwtProvider,
 )
 
+from pyrenode3.profiling import StartupProfiler
 from pyrenode3.singleton import MetaSingleton
 
 
@@ -50,12 +51,13 @@ class EmulatorInit(metaclass=MetaSingleton):
     """A class used for initializing the emulator."""
 
     def __init__(self):
-        EmulationManager.RebuildInstance()
+        with StartupProfiler().phase("EmulatorInit"):
+            EmulationManager.RebuildInstance()
 
-        Emulator.ShowAnalyzers = True
+            Emulator.ShowAnalyzers = True
 
-        self.__thread = Thread(target=Emulator.ExecuteAsMainThread, daemon=True)
-        self.__thread.start()
+            self.__thread = Thread(target=Emulator.ExecuteAsMainThread, daemon=True)
+            self.__thread.start()
 
         Cleaner().add_multiple(
             (0, EmulationManager.Instance.Clear),
@@ -75,7 +77,8 @@ class XwtInit(metaclass=MetaSingleton):
 
         self.provider = None
 
-        self.__initialize()
+        with StartupProfiler().phase("XwtInit"):
+            self.__initialize()
 
     def __initialize(self):
         self.provider = XwtProvider.Create(WindowedUserInterfaceProvider())
@@ -1,4 +1,5 @@
 import glob
+import importlib.abc
 import json
 import logging
 import os
@@ -10,15 +11,31 @@ import tarfile
 import tempfile
 import platform
 from contextlib import contextmanager
-from typing import Union
+from typing import Iterable, Optional, Union
 from subprocess import check_output, STDOUT
 
 from pythonnet import load as pythonnet_load
 from clr_loader.util.runtime_spec import DotnetCoreRuntimeSpec
 
-from pyrenode3 import env
+from pyrenode3 import cache, env
+from pyrenode3.__about__ import __version__
+from pyrenode3.profiling import StartupProfiler
 from pyrenode3.singleton import MetaSingleton
 
+MANIFEST_VERSION = 1
+
+# Assemblies loaded eagerly when assemblies are loaded lazily.
+# They contain the namespaces used by pyrenode3 itself.
+CORE_ASSEMBLIES = (
+    "Renode",
+    "Infrastructure",
+    "Emulator",
+    "Extensions",
+    "Peripherals",
+    "Mono.Posix",
+    "Mono.Posix.NETStandard",
+)
+
 
 class InitializationError(Exception):
     ...
@@ -81,7 +98,7 @@ def get_library_ext():
         raise InitializationError(msg)
 
 
-def ensure_additional_libs(renode_bin_dir):
+def ensure_additional_libs(renode_bin_dir, staged=None):
     # libMono.Unix does not exists on Windows, so just return empty if we are on Windows
     if platform.system() == "Windows":
         return []
@@ -94,14 +111,192 @@ def ensure_additional_libs(renode_bin_dir):
     src_new = bindll_dir / "native" / lib_new
     src_old = bindll_dir / "native" / lib_old
 
+    if staged is None:
+        staged = []
+
     if (renode_bin_dir / src_new).exists():
         ensure_symlink(src_new, renode_bin_dir / lib_new, relative=True, verbose=True)
+        staged.append(renode_bin_dir / lib_new)
         return [renode_bin_dir / "Mono.Posix.dll"]
     elif (renode_bin_dir / src_old).exists():
         netstd_dir = renode_bin_dir / bindll_dir / "lib/netstandard2.0"
         ensure_symlink(src_old, netstd_dir / lib_old, relative=True, verbose=True)
+        staged.append(netstd_dir / lib_old)
         return [netstd_dir / "Mono.Posix.NETStandard.dll"]
 
+    return []
+
+
+def list_assemblies(bin_dir: "pathlib.Path", add_dlls: "Iterable[Union[str, pathlib.Path]]" = ()):
+    """List assemblies that have to be loaded from `bin_dir`, in loading order."""
+    assemblies = []
+    for dll in [*bin_dir.glob("*.dll"), *add_dlls]:
+        fullpath = bin_dir / dll
+        # We do not normally ship CoreLib (except portable), and it gets loaded by other dlls anyway, but loading it directly raises an error:
+        # System.IO.FileLoadException: Could not load file or assembly 'System.Private.CoreLib, Version=6.0.0.0, Culture=neutral, PublicKeyToken=7cec85d7bea7798e'.
+        # sni.dll, hostfxr.dll, and the _cor3.dll files only exists on Windows, and causes a BadImageFormatException if loaded directly
+        if (fullpath.exists() and
+            fullpath.name != "System.Private.CoreLib.dll" and
+            fullpath.name != "sni.dll" and
+            fullpath.name != "hostfxr.dll" and
+            "_cor3.dll" not in fullpath.name):
+            assemblies.append(fullpath.absolute())
+
+    return assemblies
+
+
+def make_manifest(
+    runtime: str,
+    bin_dir: "pathlib.Path",
+    renode_dir: "pathlib.Path",
+    runtime_spec: "Optional[dict]",
+    add_dlls: "Iterable[Union[str, pathlib.Path]]" = (),
+    native_libs: "Iterable[pathlib.Path]" = (),
+) -> dict:
+    """Describe a discovered Renode installation.
+
+    Parameters
+    ----------
+    runtime : str
+        ``mono`` or ``coreclr``
+
+    runtime_spec : Optional[dict]
+        arguments passed to ``pythonnet.load``, or ``None`` to let the ``clr`` module choose the runtime
+    """
+    bin_dir = pathlib.Path(bin_dir).absolute()
+    return {
+        "version": MANIFEST_VERSION,
+        "pyrenode3": __version__,
+        "runtime": runtime,
+        "runtime_spec": runtime_spec,
+        "renode_dir": str(pathlib.Path(renode_dir).absolute()),
+        "bin_dir": str(bin_dir),
+        "assemblies": [str(x) for x in list_assemblies(bin_dir, add_dlls)],
+        "native_libs": [str(pathlib.Path(x).absolute()) for x in native_libs],
+    }
+
+
+def write_manifest(manifest: dict, path: "Union[str, pathlib.Path]") -> None:
+    cache.atomic_write(pathlib.Path(path), json.dumps(manifest, indent=2))
+
+
+def read_manifest(path: "Union[str, pathlib.Path]") -> dict:
+    with open(path) as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        msg = f"Manifest {path} has unsupported version {manifest.get('version')!r}. Please recreate it."
+        raise InitializationError(msg)
+
+    missing = [x for x in [manifest["bin_dir"], *manifest["native_libs"]] if not pathlib.Path(x).exists()]
+    if missing:
+        msg = f"Manifest {path} is out of date, {', '.join(missing)} doesn't exist. Please recreate it."
+        raise InitializationError(msg)
+
+    return manifest
+
+
+def unpack_package(path: "pathlib.Path"):
+    """Unpack Renode package.
+
+    Returns a directory with the package's content and a temporary directory object,
+    which must be kept alive as long as the content is used (``None`` if the package was cached).
+    """
+    with StartupProfiler().phase(f"extract {path.name}"):
+        if not env.pyrenode_no_cache:
+            return cache.extract_package(path), None
+
+        temp = tempfile.TemporaryDirectory()
+        with tarfile.open(path, "r") as f:
+            f.extractall(temp.name)
+
+    return pathlib.Path(temp.name), temp
+
+
+def add_reference(clr, dll: "pathlib.Path"):
+    # XXX(pkoscik): Workaround for AssemblyName behavior change in .NET >= 9.0.
+    # In .NET 8, passing a full DLL path (with extension) to AssemblyName(string) raised
+    # FileLoadException, which Python.NET relied on. In .NET 9, the same path is parsed as
+    # a valid assembly name, breaking Python.NET's loading heuristic. Paths without extension
+    # are valid in both runtimes.
+    clr.AddReference(str(dll.with_suffix("")))
+
+
+def renode_version() -> str:
+    """Get an identifier of the loaded Renode build."""
+    import clr
+    from Antmicro.Renode.Core import Machine
+
+    return str(clr.GetClrType(Machine).Assembly.ManifestModule.ModuleVersionId)
+
+
+class LazyAssemblies(importlib.abc.MetaPathFinder):
+    """A class used for loading assemblies when they are first needed.
+
+    Assemblies are loaded when the runtime fails to resolve them as a dependency
+    or when a namespace which isn't provided by any loaded assembly is imported.
+    """
+
+    def __init__(self, assemblies: "Iterable[pathlib.Path]"):
+        self.__pending = {dll.stem: dll for dll in assemblies}
+
+    def install(self):
+        from System import AppDomain
+
+        AppDomain.CurrentDomain.AssemblyResolve += self.__resolve
+        # The clr module's finder must be tried first
+        sys.meta_path.append(self)
+
+    def load(self, name: str) -> bool:
+        import clr
+
+        dll = self.__pending.pop(name, None)
+        if dll is None:
+            return False
+
+        logging.debug(f"Lazily loading {dll}.")
+        with StartupProfiler().phase(dll.name, kind="assembly"):
+            add_reference(clr, dll)
+        return True
+
+    def load_all(self):
+        for name in list(self.__pending):
+            self.load(name)
+
+    def find_spec(self, fullname, path, target=None):
+        if not self.__pending:
+            return None
+
+        # Assemblies are often named after the namespace they provide, try them first
+        parts = fullname.split(".")
+        loaded = [self.load(".".join(parts[:i])) for i in range(len(parts), 0, -1)]
+
+        if not any(loaded):
+            # Only handle namespaces of already loaded assemblies, not every missing Python module
+            if type(sys.modules.get(parts[0])).__name__ != "ModuleObject":
+                return None
+            self.load_all()
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                return spec
+
+        return None
+
+    def __resolve(self, _sender, args):
+        from System.Reflection import Assembly, AssemblyName
+
+        name = AssemblyName(args.Name).Name
+        dll = self.__pending.pop(name, None)
+        if dll is None:
+            return None
+
+        logging.debug(f"Lazily loading {dll} requested by the runtime.")
+        with StartupProfiler().phase(dll.name, kind="assembly"):
+            return Assembly.LoadFrom(str(dll))
 
 
 class RenodeLoader(metaclass=MetaSingleton):
@@ -111,6 +306,8 @@ class RenodeLoader(metaclass=MetaSingleton):
         self.__initialized = False
         self.__bin_dir = None
         self.__renode_dir = None
+        self.__manifest = None
+        self.__lazy = None
 
     @property
     def is_initialized(self):
@@ -120,6 +317,9 @@ class RenodeLoader(metaclass=MetaSingleton):
     @property
     def root(self) -> "pathlib.Path":
         """Get path to the Renode's root."""
+        if self.__renode_dir is None:
+            self.__load_lazily()
+
         if self.__renode_dir is None:
             msg = "RenodeLoader wasn't initialized"
             raise InitializationError(msg)
@@ -129,33 +329,48 @@ class RenodeLoader(metaclass=MetaSingleton):
     @property
     def binaries(self) -> "pathlib.Path":
         """Get path to the directory containing Renode's DLLs."""
+        if self.__bin_dir is None:
+            self.__load_lazily()
+
         if self.__bin_dir is None:
             msg = "RenodeLoader wasn't initialized"
             raise InitializationError(msg)
 
         return self.__bin_dir
 
+    @property
+    def manifest(self) -> dict:
+        """Get the manifest describing the loaded Renode (see :func:`make_manifest`)."""
+        if self.__manifest is None:
+            self.__load_lazily()
+
+        if self.__manifest is None:
+            msg = "RenodeLoader wasn't initialized"
+            raise InitializationError(msg)
+
+        return self.__manifest
+
+    def __load_lazily(self):
+        if env.pyrenode_lazy_import and not env.pyrenode_skip_load:
+            import pyrenode3
+
+            pyrenode3.ensure_loaded()
+
+    @classmethod
+    def from_manifest(cls, path: "Union[str, pathlib.Path]"):
+        """Load Renode described by a manifest created with ``pyrenode3 prepare``."""
+        return cls.__load(read_manifest(path))
+
     @classmethod
     def from_mono_arch_pkg(cls, path: "Union[str, pathlib.Path]"):
         """Load Renode from Arch package."""
         path = pathlib.Path(path)
-        temp = tempfile.TemporaryDirectory()
-        with tarfile.open(path, "r") as f:
-            f.extractall(temp.name)
+        pkg_dir, temp = unpack_package(path)
 
-        renode_dir = pathlib.Path(temp.name) / "opt/renode"
+        renode_dir = pkg_dir / "opt/renode"
 
-        pythonnet_load("mono")
-
-        loader = cls()
-        loader.__setup(
-            renode_dir / "bin",
-            renode_dir,
-            temp=temp,
-            add_dlls=["Renode.exe"]
-        )
-
-        return loader
+        manifest = make_manifest("mono", renode_dir / "bin", renode_dir, {}, add_dlls=["Renode.exe"])
+        return cls.__load(manifest, temp=temp)
 
     @staticmethod
     def discover_bin_dir(renode_dir, runtime):
@@ -187,26 +402,22 @@ class RenodeLoader(metaclass=MetaSingleton):
         """Load Renode from Mono build."""
         renode_dir = pathlib.Path(path)
 
-        pythonnet_load("mono")
-
-        loader = cls()
-        loader.__setup(
+        manifest = make_manifest(
+            "mono",
             cls.discover_bin_dir(renode_dir, "mono"),
             renode_dir,
-            add_dlls=["Renode.exe"]
+            {},
+            add_dlls=["Renode.exe"],
         )
-
-        return loader
+        return cls.__load(manifest)
 
     @classmethod
     def from_net_pkg(cls, path: "Union[str, pathlib.Path]"):
         """Load Renode from dotnet package."""
         path = pathlib.Path(path)
-        temp = tempfile.TemporaryDirectory()
-        with tarfile.open(path, "r") as f:
-            f.extractall(temp.name)
+        pkg_dir, temp = unpack_package(path)
 
-        renode_dirs = list(pathlib.Path(temp.name).glob("renode*"))
+        renode_dirs = list(pkg_dir.glob("renode*"))
         if len(renode_dirs) > 1:
             logging.error(f"In {path} package should be exactly one directory. Found {len(renode_dirs)}.")
             sys.exit(1)
@@ -214,35 +425,36 @@ class RenodeLoader(metaclass=MetaSingleton):
         renode_dir = renode_dirs[0]
         renode_bin_dir = renode_dir / "bin"
 
-        additional_libs = ensure_additional_libs(renode_bin_dir)
-
-        pythonnet_load("coreclr", runtime_config=renode_bin_dir / "Renode.runtimeconfig.json")
+        staged = []
+        additional_libs = ensure_additional_libs(renode_bin_dir, staged)
 
-        loader = cls()
-        loader.__setup(
+        manifest = make_manifest(
+            "coreclr",
             renode_bin_dir,
             renode_dir,
-            temp=temp,
+            {"runtime_config": str((renode_bin_dir / "Renode.runtimeconfig.json").absolute())},
             add_dlls=additional_libs,
+            native_libs=staged,
         )
-        return loader
+        return cls.__load(manifest, temp=temp)
 
     @classmethod
     def from_net_build(cls, path: "Union[str, pathlib.Path]"):
         renode_dir = pathlib.Path(path)
         renode_bin_dir = cls.discover_bin_dir(renode_dir, "coreclr")
 
-        additional_libs = ensure_additional_libs(renode_bin_dir)
-
-        pythonnet_load("coreclr", runtime_config=renode_bin_dir / "Renode.runtimeconfig.json")
+        staged = []
+        additional_libs = ensure_additional_libs(renode_bin_dir, staged)
 
-        loader = cls()
-        loader.__setup(
+        manifest = make_manifest(
+            "coreclr",
             renode_bin_dir,
             renode_dir,
+            {"runtime_config": str((renode_bin_dir / "Renode.runtimeconfig.json").absolute())},
             add_dlls=additional_libs,
+            native_libs=staged,
         )
-        return loader
+        return cls.__load(manifest)
 
     @classmethod
     def from_net_bin(cls, path: "Union[str, pathlib.Path]"):
@@ -250,10 +462,21 @@ class RenodeLoader(metaclass=MetaSingleton):
         renode_bin = pathlib.Path(path)
         renode_dir = renode_bin.parent
 
+        # Preparing the extracted binaries is costly, so the result is cached per binary as a manifest
+        cached = None if env.pyrenode_no_cache else cache.cache_dir() / "portable" / f"{cache.stamp(renode_bin)}.json"
+        if cached is not None and cached.exists():
+            try:
+                manifest = read_manifest(cached)
+            except (InitializationError, OSError, ValueError) as e:
+                logging.info(f"Ignoring cached manifest of {renode_bin}: {e}")
+            else:
+                return cls.__load(manifest)
+
         # As a side effect, executing the binary causes the embedded dlls to be extracted to:
         #     ~/.net/<executable name>/<executable hash>/
         # The location gets printed to stderr (or selected file) if suitable environment variables are set.
-        out = check_output([renode_bin, "--version"], stderr=STDOUT, env=os.environ | {"COREHOST_TRACE": "1", "COREHOST_TRACEFILE": ""}, text=True)
+        with StartupProfiler().phase(f"{renode_bin.name} --version"):
+            out = check_output([renode_bin, "--version"], stderr=STDOUT, env=os.environ | {"COREHOST_TRACE": "1", "COREHOST_TRACEFILE": ""}, text=True)
 
         binaries = re.search(r"will be extracted to \[(.*)\] directory", out).group(1)
         binaries = pathlib.Path(binaries)
@@ -340,13 +563,18 @@ class RenodeLoader(metaclass=MetaSingleton):
             ensure_symlink(renode_dir / ("libhostfxr" + LIB_EXT), binaries / ("libhostfxr" + LIB_EXT))
         ensure_symlink(binaries / "Renode.deps.json", runtime / "Microsoft.NETCore.App.deps.json", relative=True)
 
-        loader = cls()
-        loader.__renode_dir = renode_dir
-        with loader.in_root():
-            pythonnet_load("coreclr", dotnet_root=binaries, runtime_spec=DotnetCoreRuntimeSpec("Microsoft.NETCore.App", tfm_full, runtime))
-        loader.__setup(binaries, renode_dir)
+        runtime_spec = {
+            "dotnet_root": str(binaries.absolute()),
+            "name": "Microsoft.NETCore.App",
+            "version": tfm_full,
+            "path": str(runtime.absolute()),
+        }
+        staged = [runtime / lib.name for lib in native_libs_to_load]
+        manifest = make_manifest("coreclr", binaries, renode_dir, runtime_spec, native_libs=staged)
+        if cached is not None:
+            write_manifest(manifest, cached)
 
-        return loader
+        return cls.__load(manifest)
 
     @classmethod
     def from_installed(cls):
@@ -362,16 +590,9 @@ class RenodeLoader(metaclass=MetaSingleton):
         #      to different location this must be changed!
         renode_dir = pathlib.Path("/opt/renode")
 
-        loader = cls()
-        loader.__setup(
-            renode_dir / "bin",
-            renode_dir,
-            # XXX: Assume Mono runtime. Currently only Mono version can be installed as package.
-            runtime="mono",
-            add_dlls=["Renode.exe"]
-        )
-
-        return loader
+        # XXX: Assume Mono runtime. Currently only Mono version can be installed as package.
+        manifest = make_manifest("mono", renode_dir / "bin", renode_dir, None, add_dlls=["Renode.exe"])
+        return cls.__load(manifest)
 
     @contextmanager
     def in_root(self):
@@ -382,43 +603,63 @@ class RenodeLoader(metaclass=MetaSingleton):
         finally:
             os.chdir(last_cwd)
 
+    @classmethod
+    def __load(cls, manifest: dict, **kwargs):
+        loader = cls()
+        loader.__renode_dir = pathlib.Path(manifest["renode_dir"])
+        # The manifest might point to a package extracted into the cache by another process
+        cache.lease(loader.__renode_dir)
+
+        spec = manifest["runtime_spec"]
+        with StartupProfiler().phase(f"pythonnet.load({manifest['runtime']!r})"):
+            if spec is None:
+                # The runtime is selected by the clr module
+                pass
+            elif "dotnet_root" in spec:
+                runtime_spec = DotnetCoreRuntimeSpec(spec["name"], spec["version"], pathlib.Path(spec["path"]))
+                with loader.in_root():
+                    pythonnet_load(manifest["runtime"], dotnet_root=spec["dotnet_root"], runtime_spec=runtime_spec)
+            else:
+                pythonnet_load(manifest["runtime"], **spec)
+
+        if kwargs.get("temp") is not None:
+            # The content is removed together with the process, so the manifest can't be reused
+            manifest["temporary"] = True
+
+        loader.__setup(manifest, **kwargs)
+        return loader
+
     def __load_asm(self):
         # Import clr here, because it must be done after the proper runtime is selected.
         # If the runtime isn't loaded, the clr module loads the default runtime (mono) automatically.
         # It is an issue when we use non-default runtime, e.g. coreclr.
         import clr
 
-        dlls = [*self.binaries.glob("*.dll")]
-        dlls.extend(self.__extra.get("add_dlls", []))
-
-        for dll in dlls:
-            fullpath = self.binaries / dll
-            # We do not normally ship CoreLib (except portable), and it gets loaded by other dlls anyway, but loading it directly raises an error:
-            # System.IO.FileLoadException: Could not load file or assembly 'System.Private.CoreLib, Version=6.0.0.0, Culture=neutral, PublicKeyToken=7cec85d7bea7798e'.
-            # sni.dll, hostfxr.dll, and the _cor3.dll files only exists on Windows, and causes a BadImageFormatException if loaded directly
-            if (fullpath.exists() and
-                fullpath.name != "System.Private.CoreLib.dll" and
-                fullpath.name != "sni.dll" and
-                fullpath.name != "hostfxr.dll" and
-                "_cor3.dll" not in fullpath.name):
-                # XXX(pkoscik): Workaround for AssemblyName behavior change in .NET >= 9.0.
-                # In .NET 8, passing a full DLL path (with extension) to AssemblyName(string) raised
-                # FileLoadException, which Python.NET relied on. In .NET 9, the same path is parsed as
-                # a valid assembly name, breaking Python.NET's loading heuristic. Paths without extension
-                # are valid in both runtimes.
-                clr.AddReference(str(fullpath.with_suffix("")))
-
-    def __setup(self,
-        bin_dir: "Union[str, pathlib.Path]",
-        renode_dir: "Union[str, pathlib.Path]",
-        **kwargs,
-    ):
+        assemblies = [pathlib.Path(x) for x in self.__manifest["assemblies"]]
+
+        if env.pyrenode_lazy_assemblies:
+            self.__lazy = LazyAssemblies(x for x in assemblies if x.stem not in CORE_ASSEMBLIES)
+            self.__lazy.install()
+            assemblies = [x for x in assemblies if x.stem in CORE_ASSEMBLIES]
+
+        with StartupProfiler().phase("load assemblies"):
+            for dll in assemblies:
+                with StartupProfiler().phase(dll.name, kind="assembly"):
+                    add_reference(clr, dll)
+
+    def load_pending_assemblies(self):
+        """Load all assemblies that haven't been loaded yet in the lazy mode."""
+        if self.__lazy is not None:
+            self.__lazy.load_all()
+
+    def __setup(self, manifest: dict, **kwargs):
         if self.__initialized:
             msg = "RenodeLoader is already initialized"
             raise InitializationError(msg)
 
-        self.__bin_dir = pathlib.Path(bin_dir).absolute()
-        self.__renode_dir = pathlib.Path(renode_dir).absolute()
+        self.__bin_dir = pathlib.Path(manifest["bin_dir"]).absolute()
+        self.__renode_dir = pathlib.Path(manifest["renode_dir"]).absolute()
+        self.__manifest = manifest
         self.__extra = kwargs
 
         self.__load_asm()
@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+class Job(NamedTuple):
+    """A job run by :class:`EmulationPool` in a clean emulation.
+
+    `script` is called with the :class:`Emulation <pyrenode3.wrappers.Emulation>`, the created
+    :class:`Machine <pyrenode3.wrappers.Machine>` (``None`` if neither `repl` nor `elf` is given)
+    and `args`. It has to be picklable (e.g. defined at a module's top level), and so does its result.
+    """
+
+    script: "Callable[..., Any]"
+    repl: "Optional[str]" = None
+    elf: "Optional[str]" = None
+    args: "Tuple" = ()
+    machine_name: str = "machine0"
+
+
+class _Worker:
+    # Barrier of warm-up pings, shared by all workers
+    barrier = None
+
+
+def _initialize(
+    initializer: "Optional[Callable[[], None]]", barrier: "Optional[multiprocessing.synchronize.Barrier]"
+) -> None:
+    _Worker.barrier = barrier
+
+    # Load the runtime and create singletons up front, so jobs don't pay for it
+    import pyrenode3
+    from pyrenode3.loader import RenodeLoader
+
+    pyrenode3.ensure_loaded()
+    RenodeLoader().load_pending_assemblies()
+
+    from pyrenode3.wrappers import Emulation, Monitor
+
+    Emulation()
+    Monitor()
+
+    if initializer is not None:
+        initializer()
+
+
+def _ping() -> int:
+    # A worker can't take another ping before all of them got one, so each worker gets exactly one
+    _Worker.barrier.wait()
+    return os.getpid()
+
+
+def _run(job: "Job") -> Any:
+    from pyrenode3.wrappers import Emulation
+
+    emulation = Emulation()
+    try:
+        machine = None
+        if job.repl is not None or job.elf is not None:
+            machine = emulation.add_mach(job.machine_name)
+        if job.repl is not None:
+            machine.load_repl(job.repl)
+        if job.elf is not None:
+            machine.load_elf(job.elf)
+
+        return job.script(emulation, machine, *job.args)
+    finally:
+        emulation.clear()
+
+
+class EmulationPool:
+    """A pool of worker processes running independent emulations.
+
+    Each worker loads Renode once and then runs jobs one by one, clearing the emulation
+    in between. Processes are spawned, so workers don't inherit the parent's .NET runtime.
+    """
+
+    def __init__(
+        self,
+        workers: "Optional[int]" = None,
+        initializer: "Optional[Callable[[], None]]" = None,
+        *,
+        warm: bool = True,
+    ):
+        """Start the pool.
+
+        Parameters
+        ----------
+        workers : Optional[int]
+            number of worker processes, by default the number of CPUs
+
+        initializer : Optional[Callable[[], None]]
+            picklable function called in each worker after Renode is loaded
+
+        warm : bool
+            whether to wait until all workers are started and initialized
+        """
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context("spawn")
+        # Synchronization primitives can only be passed to processes when they are started
+        barrier = context.Barrier(self.workers) if warm else None
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_initialize,
+            initargs=(initializer, barrier),
+        )
+
+        if warm:
+            # Every worker completes its initializer before it takes a ping
+            for f in [self.__executor.submit(_ping) for _ in range(self.workers)]:
+                f.result()
+
+    def __enter__(self) -> "EmulationPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.shutdown()
+
+    def submit(self, job: "Job") -> "Future":
+        """Schedule `job` and get a future of its result."""
+        return self.__executor.submit(_run, job)
+
+    def map(self, jobs: "Iterable[Job]") -> "Iterator[Any]":
+        """Run `jobs` and get their results in the order of `jobs`."""
+        futures = [self.submit(job) for job in jobs]
+        return (f.result() for f in futures)
+
+    def as_completed(self, jobs: "Iterable[Job]") -> "Iterator[Tuple[Job, Any]]":
+        """Run `jobs` and get their results as soon as they are completed.
+
+        Raises
+        ------
+        Exception
+            An exception raised by a job, once its result is reached
+        """
+        futures = {self.submit(job): job for job in jobs}
+        for f in as_completed(futures):
+            yield futures[f], f.result()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop the workers once they complete already submitted jobs."""
+        self.__executor.shutdown(wait=wait)
@@ -0,0 +1,117 @@
+import os
+import platform
+import time
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+
+from pyrenode3 import env
+from pyrenode3.singleton import MetaSingleton
+
+
+def current_rss() -> int:
+    """Get the resident set size of the current process in bytes (0 if it can't be determined)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    # Fall back to the peak RSS, which is reported in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if platform.system() == "Darwin" else rss * 1024
+
+
+class Record(NamedTuple):
+    name: str
+    kind: str
+    depth: int
+    start: float
+    duration: float
+    rss_before: int
+    rss_after: int
+
+    @property
+    def rss_delta(self) -> int:
+        return self.rss_after - self.rss_before
+
+
+class StartupProfiler(metaclass=MetaSingleton):
+    """A class used for measuring how long each phase of pyrenode3's startup takes.
+
+    Profiling is enabled by setting ``PYRENODE_PROFILE_STARTUP`` before pyrenode3 is imported.
+    """
+
+    def __init__(self):
+        self.enabled = bool(env.pyrenode_profile_startup)
+        self.__origin = time.perf_counter()
+        self.__records = []
+        self.__depth = 0
+
+    @property
+    def records(self) -> "List[Record]":
+        """Get recorded phases in the order they were started."""
+        return sorted(self.__records, key=lambda x: x.start)
+
+    @contextmanager
+    def phase(self, name: str, kind: str = "phase"):
+        """Measure wall time and RSS change of the code executed in the context."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        rss_before = current_rss()
+        self.__depth += 1
+        try:
+            yield
+        finally:
+            self.__depth -= 1
+            self.__records.append(
+                Record(
+                    name,
+                    kind,
+                    self.__depth,
+                    start - self.__origin,
+                    time.perf_counter() - start,
+                    rss_before,
+                    current_rss(),
+                )
+            )
+
+    def report(self, top: "Optional[int]" = 10) -> str:
+        """Format recorded phases as a human-readable report.
+
+        Parameters
+        ----------
+        top : Optional[int]
+            number of the slowest assemblies to list, ``None`` lists all of them
+        """
+        if not self.enabled:
+            return f"Startup profiling is disabled, set {env.PYRENODE_PROFILE_STARTUP} to enable it."
+
+        lines = [f"{'phase':<60} {'start [ms]':>12} {'time [ms]':>12} {'RSS [MiB]':>12} {'ΔRSS [MiB]':>12}"]
+
+        def line(r, name):
+            return (
+                f"{name:<60} {r.start * 1e3:>12.1f} {r.duration * 1e3:>12.1f} "
+                f"{r.rss_after / 2**20:>12.1f} {r.rss_delta / 2**20:>+12.1f}"
+            )
+
+        phases = [r for r in self.records if r.kind == "phase"]
+        for r in phases:
+            lines.append(line(r, "  " * r.depth + r.name))
+
+        assemblies = sorted((r for r in self.__records if r.kind == "assembly"), key=lambda x: -x.duration)
+        if assemblies:
+            total = sum(r.duration for r in assemblies)
+            lines.append("")
+            lines.append(f"{len(assemblies)} assemblies loaded in {total * 1e3:.1f} ms, the slowest:")
+            for r in assemblies[:top]:
+                lines.append(line(r, "  " + r.name))
+
+        return "\n".join(lines)
@@ -0,0 +1,22 @@
+"""Proxy classes of wrapped .NET types, used when ``PYRENODE_PROXIES`` is set.
+
+A proxy class is created when an object of its .NET type is wrapped for the first time
+and from then on it's available in this module under :func:`proxy_name` of the type.
+Typed stubs of this module can be generated with ``pyrenode3 stubs``.
+"""
+
+import re
+
+
+def proxy_name(clr_type) -> str:
+    """Get the name of the proxy class of .NET type `clr_type`, e.g. ``Antmicro_Renode_Peripherals_UART_NS16550``."""
+    return re.sub(r"\W", "_", clr_type.FullName)
+
+
+def register(proxy: type, clr_type) -> None:
+    """Make `proxy` available in this module, unless another proxy of `clr_type` already is."""
+    name = proxy_name(clr_type)
+    if name not in globals():
+        proxy.__module__ = __name__
+        proxy.__name__ = proxy.__qualname__ = name
+        globals()[name] = proxy
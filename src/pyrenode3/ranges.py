@@ -0,0 +1,56 @@
+from bisect import bisect_right
+from typing import Callable, Iterable, List, Tuple
+
+
+def merge_ranges(ranges: "Iterable[Tuple[int, int]]") -> "List[Tuple[int, int]]":
+    """Merge adjacent and overlapping ranges.
+
+    Parameters
+    ----------
+    ranges : Iterable[Tuple[int, int]]
+        pairs of address and length
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        Pairs of address and length of contiguous blocks covering `ranges`, sorted by address
+    """
+    blocks = []  # [start, end]
+    for address, length in sorted(ranges):
+        if blocks and address <= blocks[-1][1]:
+            blocks[-1][1] = max(blocks[-1][1], address + length)
+        else:
+            blocks.append([address, address + length])
+
+    return [(start, end - start) for start, end in blocks]
+
+
+def read_ranges(read: "Callable[[int, int], bytes]", ranges: "Iterable[Tuple[int, int]]") -> "List[bytes]":
+    """Read many ranges with one call of `read` per contiguous block.
+
+    Parameters
+    ----------
+    read : Callable[[int, int], bytes]
+        function reading the given number of bytes from the given address
+
+    ranges : Iterable[Tuple[int, int]]
+        pairs of address and length
+
+    Returns
+    -------
+    List[bytes]
+        Content of the ranges, in the order they were given
+    """
+    ranges = list(ranges)
+    blocks = merge_ranges(ranges)
+
+    starts = [start for start, _ in blocks]
+    data = [read(start, length) for start, length in blocks]
+
+    result = []
+    for address, length in ranges:
+        i = bisect_right(starts, address) - 1
+        offset = address - starts[i]
+        result.append(data[i][offset : offset + length])
+
+    return result
@@ -0,0 +1,105 @@
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from Antmicro.Renode.Peripherals.CPU import RegisterValue
+
+from pyrenode3.conversion import interfaces_to_classes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from pyrenode3 import wrappers
+
+# Fields of register snapshots
+FIELDS = [
+    ("machine", "U64"),
+    ("cpu", "i4"),
+    ("register", "i4"),
+    ("value", "u8"),
+    ("width", "u2"),
+]
+
+# Width of the widest register stored in snapshots, the size of their ``value`` field
+MAX_REGISTER_WIDTH = 64
+
+# Registers of CPUs: (.NET type, model) -> ((index, width), ...)
+_layouts = {}
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ModuleNotFoundError as e:
+        raise ImportError from e
+
+    return np
+
+
+def _accessors(cpu):
+    # Older Renode versions only provide the *Unsafe variants
+    if hasattr(cpu, "GetRegister"):
+        return cpu.GetRegister, cpu.SetRegister
+    return cpu.GetRegisterUnsafe, cpu.SetRegisterUnsafe
+
+
+def register_layout(cpu) -> "Tuple[Tuple[int, int], ...]":
+    """Get indices and widths of registers of `cpu` which fit in 64 bits.
+
+    Layouts are remembered per CPU type and model, so registers of each kind of CPU are listed only once.
+    """
+    key = cpu.GetType(), str(getattr(cpu, "Model", ""))
+    layout = _layouts.get(key)
+    if layout is None:
+        registers = cpu.GetRegisters() if hasattr(cpu, "GetRegisters") else ()
+        fitting = {(int(r.Index), int(r.Width)) for r in registers if int(r.Width) <= MAX_REGISTER_WIDTH}
+        layout = _layouts[key] = tuple(sorted(fitting))
+
+    return layout
+
+
+def machine_cpus(machine: "wrappers.Machine") -> "List":
+    """Get CPUs of `machine`, in the order of their registration."""
+    return interfaces_to_classes(machine.sysbus.internal.GetCPUs())
+
+
+def snapshot(machines: "Dict[str, wrappers.Machine]") -> "np.ndarray":
+    """Read registers of all CPUs of `machines` into a structured NumPy array.
+
+    Parameters
+    ----------
+    machines : Dict[str, wrappers.Machine]
+        machines by their names
+
+    Returns
+    -------
+    np.ndarray
+        Array with ``machine``, ``cpu`` (index in the machine), ``register``, ``value`` and ``width`` fields
+    """
+    np = _numpy()
+
+    rows = []
+    for name, machine in machines.items():
+        for i, cpu in enumerate(machine_cpus(machine)):
+            get, _ = _accessors(cpu)
+            rows.extend((name, i, index, int(get(index).RawValue), width) for index, width in register_layout(cpu))
+
+    return np.array(rows, dtype=FIELDS)
+
+
+def restore(registers: "np.ndarray", machines: "Dict[str, wrappers.Machine]") -> None:
+    """Set registers to values from a snapshot created by :func:`snapshot`.
+
+    Only registers listed in `registers` are set; filter the snapshot to set a part of them.
+    """
+    setters = {}
+    for row in registers:
+        name = str(row["machine"])
+        if name not in setters:
+            setters[name] = [_accessors(cpu)[1] for cpu in machine_cpus(machines[name])]
+
+        value = RegisterValue.Create(int(row["value"]), int(row["width"]))
+        setters[name][int(row["cpu"])](int(row["register"]), value)
+
+
+def changed(before: "np.ndarray", after: "np.ndarray") -> "np.ndarray":
+    """Get rows of `after` with values different than in `before`; both snapshots must have the same layout."""
+    return after[before["value"] != after["value"]]
@@ -0,0 +1,158 @@
+import hashlib
+import inspect
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Callable, Iterable, Optional, Union
+
+from Antmicro.Renode.Core import EmulationManager
+
+from pyrenode3 import cache, wrappers
+from pyrenode3.loader import renode_version
+from pyrenode3.rpath import RPath
+
+
+def _input_digest(location: "Union[str, pathlib.Path]") -> str:
+    # Platform descriptions are looked up in Renode's root as well, like Machine.load_repl does
+    try:
+        path = RPath(location).path
+    except FileNotFoundError:
+        with RPath.in_root():
+            path = str(pathlib.Path(RPath(location).path).resolve())
+
+    return cache.file_digest(pathlib.Path(path))
+
+
+def _source(function: "Callable") -> str:
+    try:
+        return inspect.getsource(function)
+    except (OSError, TypeError):
+        return f"{function.__module__}.{function.__qualname__}"
+
+
+class SnapshotCache:
+    """Emulation snapshots stored on disk under a digest of everything used to create them.
+
+    A snapshot's key covers the Renode build, the content of input files (platform descriptions,
+    binaries, device trees, ...) and the source of functions which set up the emulation,
+    so a change of any of them makes the emulation boot again instead of using a stale snapshot.
+    """
+
+    def __init__(self, directory: "Optional[Union[str, pathlib.Path]]" = None):
+        self.directory = pathlib.Path(directory) if directory is not None else cache.cache_dir() / "snapshots"
+
+    def key(
+        self,
+        inputs: "Iterable[Union[str, pathlib.Path]]" = (),
+        functions: "Iterable[Callable]" = (),
+        extra: "Iterable[str]" = (),
+    ) -> str:
+        """Get a key of a snapshot.
+
+        Parameters
+        ----------
+        inputs
+            paths or URLs of files the emulation is created from
+
+        functions
+            functions setting up the emulation; their source is part of the key
+
+        extra
+            any other strings distinguishing snapshots
+        """
+        h = hashlib.sha256()
+        parts = [
+            renode_version(),
+            *(_input_digest(x) for x in inputs),
+            *(_source(x) for x in functions),
+            *extra,
+        ]
+        for part in parts:
+            h.update(part.encode())
+            h.update(b"\0")
+
+        return h.hexdigest()
+
+    def path(self, key: str) -> "pathlib.Path":
+        return self.directory / f"{key}.save"
+
+    def load(self, key: str) -> bool:
+        """Replace the current emulation with the snapshot stored under `key`.
+
+        Returns
+        -------
+        bool
+            Whether the snapshot exists
+        """
+        path = self.path(key)
+        if not path.exists():
+            return False
+
+        logging.info(f"Loading emulation from {path}.")
+        EmulationManager.Instance.Load(str(path))
+        return True
+
+    def save(self, key: str) -> "pathlib.Path":
+        """Pause the current emulation and store it under `key`."""
+        path = self.path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        wrappers.Emulation().internal.PauseAll()
+
+        # Save to a temporary file, so other processes never load an incomplete snapshot
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{path.name}.")
+        os.close(fd)
+        try:
+            EmulationManager.Instance.Save(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            pathlib.Path(tmp).unlink(missing_ok=True)
+            raise
+
+        return path
+
+    def boot(
+        self,
+        setup: "Callable[[wrappers.Emulation], None]",
+        ready: "Optional[Callable[[wrappers.Emulation], None]]" = None,
+        inputs: "Iterable[Union[str, pathlib.Path]]" = (),
+        extra: "Iterable[str]" = (),
+    ) -> bool:
+        """Restore the emulation from a snapshot or create it and store its snapshot.
+
+        Without a snapshot, `setup` creates the emulation and `ready` runs it until it reaches
+        the state to be snapshotted, e.g. by waiting for a shell prompt. In both cases
+        the emulation is paused once this method returns.
+
+        Parameters
+        ----------
+        setup : Callable[[wrappers.Emulation], None]
+            function creating machines and loading software
+
+        ready : Optional[Callable[[wrappers.Emulation], None]]
+            function returning once the emulation is ready
+
+        inputs
+            paths or URLs of files used by `setup`
+
+        extra
+            any other strings distinguishing snapshots
+
+        Returns
+        -------
+        bool
+            Whether the emulation was restored from a snapshot
+        """
+        functions = [setup] if ready is None else [setup, ready]
+        key = self.key(inputs, functions, extra)
+        if self.load(key):
+            return True
+
+        emulation = wrappers.Emulation()
+        setup(emulation)
+        if ready is not None:
+            ready(emulation)
+
+        self.save(key)
+        return False
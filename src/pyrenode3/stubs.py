@@ -0,0 +1,156 @@
+import keyword
+import pathlib
+import sysconfig
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional, Union
+
+import clr
+from Antmicro.Renode.Core import Emulation, Machine
+from Antmicro.Renode.Peripherals import IPeripheral
+from Antmicro.Renode.Utilities import TypeManager
+from System import AppDomain
+
+from pyrenode3 import cache
+from pyrenode3.loader import RenodeLoader, renode_version
+from pyrenode3.proxies import proxy_name
+
+# A partial stub package (PEP 561), so type checkers use it for pyrenode3.proxies
+# and pyrenode3 itself for everything else
+STUBS_PACKAGE = "pyrenode3-stubs"
+
+_PRIMITIVES = {
+    "System.Boolean": "bool",
+    "System.Byte": "int",
+    "System.SByte": "int",
+    "System.Int16": "int",
+    "System.UInt16": "int",
+    "System.Int32": "int",
+    "System.UInt32": "int",
+    "System.Int64": "int",
+    "System.UInt64": "int",
+    "System.Single": "float",
+    "System.Double": "float",
+    "System.Decimal": "float",
+    "System.Char": "str",
+    "System.String": "str",
+    "System.Void": "None",
+}
+
+
+def _annotation(kls) -> str:
+    if kls.IsByRef:
+        kls = kls.GetElementType()
+
+    return _PRIMITIVES.get(kls.FullName, "Any")
+
+
+def _identifier(name: str) -> "Optional[str]":
+    if not name.isidentifier():
+        return None
+
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
+def _signature(method, skip: int = 0) -> str:
+    params = ["self"]
+    for param in list(method.GetParameters())[skip:]:
+        name = _identifier(param.Name) or f"arg{param.Position}"
+        default = " = ..." if param.IsOptional else ""
+        params.append(f"{name}: {_annotation(param.ParameterType)}{default}")
+
+    return f"({', '.join(params)}) -> {_annotation(method.ReturnType)}"
+
+
+def _wrapper_name(kls) -> "Optional[str]":
+    if clr.GetClrType(Machine).IsAssignableFrom(kls):
+        return "Machine"
+    if clr.GetClrType(Emulation).IsAssignableFrom(kls):
+        return "Emulation"
+    if clr.GetClrType(IPeripheral).IsAssignableFrom(kls):
+        return "Peripheral"
+    return None
+
+
+def wrapped_types() -> "Iterator":
+    """Get public .NET classes which are wrapped by pyrenode3's wrappers."""
+    for assembly in AppDomain.CurrentDomain.GetAssemblies():
+        try:
+            types = assembly.GetExportedTypes()
+        except Exception:  # noqa: S112
+            # Dynamic assemblies don't support listing their types
+            continue
+
+        for kls in types:
+            if kls.IsClass and not kls.ContainsGenericParameters and _wrapper_name(kls) is not None:
+                yield kls
+
+
+def _class_stub(kls) -> "Iterable[str]":
+    yield f"class {proxy_name(kls)}({_wrapper_name(kls)}):"
+    yield f'    """Proxy of ``{kls.FullName}``."""'
+
+    for prop in kls.GetProperties():
+        if (name := _identifier(prop.Name)) is not None and not prop.GetIndexParameters():
+            yield f"    {name}: {_annotation(prop.PropertyType)}"
+
+    methods = defaultdict(list)
+    for method in kls.GetMethods():
+        if not method.IsSpecialName and not method.IsStatic:
+            methods[method.Name].append(_signature(method))
+    for method in TypeManager.Instance.GetExtensionMethods(kls):
+        methods[method.Name].append(_signature(method, skip=1))
+
+    for method_name, overloads in sorted(methods.items()):
+        if (name := _identifier(method_name)) is None:
+            continue
+        signatures = sorted(set(overloads))
+        for signature in signatures:
+            if len(signatures) > 1:
+                yield "    @overload"
+            yield f"    def {name}{signature}: ..."
+
+
+def generate_stubs(output_dir: "Optional[Union[str, pathlib.Path]]" = None, *, force: bool = False) -> "pathlib.Path":
+    """Generate typed stubs of :mod:`pyrenode3.proxies` for all wrapped .NET classes.
+
+    Stubs are written as the ``pyrenode3-stubs`` stub package, by default into site-packages
+    of the running interpreter, where type checkers find it. Stubs up to date with the loaded
+    Renode build aren't regenerated.
+
+    Returns
+    -------
+    pathlib.Path
+        Directory containing the stub package
+    """
+    if output_dir is None:
+        output_dir = sysconfig.get_paths()["purelib"]
+
+    output_dir = pathlib.Path(output_dir)
+    package = output_dir / STUBS_PACKAGE
+    header = f"# Generated by pyrenode3 for Renode build {renode_version()}"
+    try:
+        with open(package / "proxies.pyi") as f:
+            if f.readline().rstrip("\n") == header and not force:
+                return output_dir
+    except OSError:
+        pass
+
+    # Stubs should cover everything Renode provides, not only what was loaded so far
+    RenodeLoader().load_pending_assemblies()
+
+    lines = [
+        header,
+        "from typing import Any, overload",
+        "",
+        "from pyrenode3.wrappers import Emulation, Machine, Peripheral",
+        "",
+        "def proxy_name(clr_type: Any) -> str: ...",
+        "def register(proxy: type, clr_type: Any) -> None: ...",
+    ]
+    for kls in sorted(wrapped_types(), key=lambda x: x.FullName):
+        lines.extend(["", ""])
+        lines.extend(_class_stub(kls))
+
+    cache.atomic_write(package / "py.typed", "partial\n")
+    cache.atomic_write(package / "proxies.pyi", "\n".join(lines) + "\n")
+    return output_dir
@@ -0,0 +1,358 @@
+import asyncio
+import codecs
+import re
+import threading
+from collections import deque
+from typing import AsyncIterator, Iterator, NamedTuple, Optional, Union
+
+import clr
+from System import Action, Byte, Delegate
+from System.IO import MemoryStream
+
+from pyrenode3 import wrappers
+from pyrenode3.aio import Completion, to_interval
+from pyrenode3.conversion import as_memoryview
+
+
+class UartChunk(NamedTuple):
+    # Virtual time, in seconds, at which the chunk was handed over to Python
+    timestamp: float
+    data: bytes
+
+
+class UartStream:
+    """Output of a UART delivered to Python in chunks instead of byte by byte.
+
+    Characters are appended to a .NET ``MemoryStream`` by a .NET delegate, so transmitting them
+    doesn't involve Python at all. The first character arriving at an empty stream schedules a drain
+    of the stream on the machine's thread `interval` virtual seconds later, which hands its content
+    over to Python if it holds at least `threshold` bytes. An idle UART costs nothing.
+
+    Chunks can be read with :meth:`read`, by iterating over the stream or with :meth:`chunks`
+    in asyncio code. Each chunk is read once, even if the stream has many readers. Chunks are kept
+    in a ring buffer of `max_buffer` bytes; once readers fall behind, the oldest output is dropped.
+    """
+
+    # Default size of the ring buffer of chunks not read yet, in bytes
+    MAX_BUFFER = 1 << 20
+
+    def __init__(
+        self, uart: "wrappers.Peripheral", interval: float = 1e-3, threshold: int = 1, max_buffer: int = MAX_BUFFER
+    ):
+        """Start buffering output of `uart`.
+
+        Parameters
+        ----------
+        uart : wrappers.Peripheral
+            UART to read from
+
+        interval : float
+            virtual time, in seconds, between arrival of a character and handing it over to Python
+
+        threshold : int
+            minimum number of bytes handed over to Python at a time; :meth:`flush` ignores it
+
+        max_buffer : int
+            maximum number of bytes of chunks which weren't read yet
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.max_buffer = max_buffer
+
+        self.__uart = uart.internal
+        self.__machine = uart.mach.internal
+        self.__buffer = MemoryStream()
+        self.__chunks = deque()
+        self.__size = 0  # bytes in chunks
+        self.__dropped = 0
+        self.__condition = threading.Condition()
+        self.__drain_lock = threading.Lock()
+        self.__waiters = []
+        self.__closed = False
+
+        # A .NET delegate, so no Python code runs for each character
+        self.__handler = Delegate.CreateDelegate(clr.GetClrType(Action[Byte]), self.__buffer, "WriteByte")
+        self.__event = self.__uart.GetType().GetEvent("CharReceived")
+        self.__event.AddEventHandler(self.__uart, self.__handler)
+
+        # Subscribed only while the stream waits for a character, so it runs once per burst of output
+        self.__wake_handler = Action[Byte](self.__wake)
+        self.__armed = False
+        self.__arm()
+
+    def __iter__(self) -> "Iterator[UartChunk]":
+        """Get chunks as they arrive, until the stream is closed."""
+        while (chunk := self.read()) is not None:
+            yield chunk
+
+    def __enter__(self) -> "UartStream":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def dropped(self) -> int:
+        """Number of bytes dropped because readers didn't keep up with the UART."""
+        return self.__dropped
+
+    def read(self, timeout: "Optional[float]" = None) -> "Optional[UartChunk]":
+        """Wait for the next chunk.
+
+        Returns
+        -------
+        Optional[UartChunk]
+            The chunk or ``None`` if the timeout expired or the stream is closed
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__chunks or self.__closed, timeout)
+            return self.__pop() if self.__chunks else None
+
+    async def chunks(self) -> "AsyncIterator[UartChunk]":
+        """Get chunks as they arrive, until the stream is closed, without blocking the event loop."""
+        while True:
+            with self.__condition:
+                if self.__chunks:
+                    chunk = self.__pop()
+                elif self.__closed:
+                    return
+                else:
+                    chunk = None
+                    waiter = Completion()
+                    self.__waiters.append(waiter)
+
+            if chunk is None:
+                await waiter
+            else:
+                yield chunk
+
+    def flush(self) -> None:
+        """Hand buffered bytes over to Python.
+
+        It must be called from the machine's thread or while the machine is paused.
+        """
+        self.__drain(self.__machine.LocalTimeSource.ElapsedVirtualTime.TotalSeconds, 1)
+
+    def close(self) -> None:
+        """Stop buffering output of the UART; chunks already received can still be read.
+
+        Like :meth:`flush`, it should be called from the machine's thread or while the machine is paused,
+        otherwise the last characters might be lost.
+        """
+        if self.__closed:
+            return
+
+        self.__event.RemoveEventHandler(self.__uart, self.__handler)
+        self.__disarm()
+        self.flush()
+        self.__closed = True
+        self.__publish(None)
+
+    def __arm(self) -> None:
+        if not self.__closed and not self.__armed:
+            self.__armed = True
+            self.__event.AddEventHandler(self.__uart, self.__wake_handler)
+
+    def __disarm(self) -> bool:
+        if not self.__armed:
+            return False
+
+        self.__armed = False
+        self.__event.RemoveEventHandler(self.__uart, self.__wake_handler)
+        return True
+
+    def __wake(self, _) -> None:
+        # Runs on the machine's thread, after the character was written to the buffer
+        if self.__disarm():
+            self.__machine.ScheduleAction(to_interval(self.interval), self.__tick)
+
+    def __tick(self, time) -> None:
+        if self.__closed:
+            return
+
+        self.__drain(time.TotalSeconds, self.threshold)
+        # Bytes below the threshold wait for the next character
+        self.__arm()
+
+    def __drain(self, timestamp: float, threshold: int) -> None:
+        with self.__drain_lock:
+            if self.__buffer.Length < max(threshold, 1):
+                return
+
+            data = as_memoryview(self.__buffer.ToArray()).tobytes()
+            self.__buffer.SetLength(0)
+
+        self.__publish(UartChunk(timestamp, data))
+
+    def __pop(self) -> "UartChunk":
+        chunk = self.__chunks.popleft()
+        self.__size -= len(chunk.data)
+        return chunk
+
+    def __publish(self, chunk: "Optional[UartChunk]") -> None:
+        with self.__condition:
+            if chunk is not None:
+                self.__chunks.append(chunk)
+                self.__size += len(chunk.data)
+                self.__drop(self.__size - self.max_buffer)
+            waiters, self.__waiters = self.__waiters, []
+            self.__condition.notify_all()
+
+        # Waiters of abandoned iterators are ignored once their loops are closed
+        for waiter in waiters:
+            waiter.set_result()
+
+    def __drop(self, count: int) -> None:
+        # Drop the oldest `count` bytes of chunks
+        while count > 0:
+            oldest = self.__chunks[0]
+            if len(oldest.data) > count:
+                self.__chunks[0] = oldest._replace(data=oldest.data[count:])
+                self.__size -= count
+                self.__dropped += count
+                return
+
+            self.__pop()
+            self.__dropped += len(oldest.data)
+            count -= len(oldest.data)
+
+
+class AsyncTerminalTester:
+    """asyncio counterpart of :class:`TerminalTester <pyrenode3.wrappers.TerminalTester>`.
+
+    Output of the UART is read through a :class:`UartStream`, so waiting doesn't block any thread
+    and any number of testers can be awaited at once with :func:`pyrenode3.aio.wait_any`
+    and :func:`pyrenode3.aio.wait_all`.
+    """
+
+    # Number of characters kept when no wait matches them
+    MAX_BUFFER = 1 << 20
+
+    def __init__(self, uart: "wrappers.Peripheral", timeout: float = 10, interval: float = 1e-3):
+        """Start watching output of `uart`.
+
+        Parameters
+        ----------
+        uart : wrappers.Peripheral
+            UART to watch
+
+        timeout : float
+            default timeout of waits, in virtual seconds
+
+        interval : float
+            virtual time, in seconds, between checks of the UART's output
+        """
+        self.timeout = timeout
+        self.__machine = uart.mach.internal
+        self.__stream = UartStream(uart, interval=interval)
+        self.__decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.__text = ""
+        self.__waiters = []  # (pattern, completion)
+        self.__reader = None
+        self.__error = None
+
+    def __enter__(self) -> "AsyncTerminalTester":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    async def wait_for(
+        self, pattern: "Union[str, re.Pattern]", timeout: "Optional[float]" = None, *, regex: bool = False
+    ) -> "re.Match":
+        """Wait until `pattern` appears in the output.
+
+        Output up to the end of the match is consumed, so it isn't matched by subsequent waits.
+
+        Parameters
+        ----------
+        pattern : Union[str, re.Pattern]
+            text or regular expression to look for
+
+        timeout : Optional[float]
+            timeout in virtual seconds, the tester's default one if not given
+
+        regex : bool
+            whether a `pattern` given as ``str`` is a regular expression
+
+        Returns
+        -------
+        re.Match
+            The match
+
+        Raises
+        ------
+        TimeoutError
+            If `pattern` didn't appear in `timeout` virtual seconds
+
+        Exception
+            An exception raised while reading output of the UART
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern if regex else re.escape(pattern))
+
+        if self.__reader is None:
+            self.__reader = asyncio.ensure_future(self.__read())
+        if self.__error is not None:
+            raise self.__error
+
+        if (match := self.__consume(pattern)) is not None:
+            return match
+
+        completion = Completion()
+        waiter = pattern, completion
+        self.__waiters.append(waiter)
+
+        timeout = self.timeout if timeout is None else timeout
+        msg = f"{pattern.pattern!r} didn't appear in {timeout} s of virtual time."
+
+        def on_timeout(_):
+            # The action can't be cancelled, so it also fires after successful waits, possibly once the loop
+            # is closed; Completion ignores it then
+            if not completion.future.done():
+                completion.set_exception(TimeoutError(msg))
+
+        self.__machine.ScheduleAction(to_interval(timeout), on_timeout)
+
+        try:
+            return await completion
+        finally:
+            if waiter in self.__waiters:
+                self.__waiters.remove(waiter)
+
+    def close(self) -> None:
+        """Stop watching the UART."""
+        if self.__reader is not None:
+            self.__reader.cancel()
+        self.__stream.close()
+
+    def __consume(self, pattern: "re.Pattern") -> "Optional[re.Match]":
+        match = pattern.search(self.__text)
+        if match is not None:
+            self.__text = self.__text[match.end() :]
+
+        return match
+
+    async def __read(self) -> None:
+        try:
+            async for chunk in self.__stream.chunks():
+                self.__text += self.__decoder.decode(chunk.data)
+
+                for waiter in list(self.__waiters):
+                    pattern, completion = waiter
+                    if not completion.future.done() and (match := self.__consume(pattern)) is not None:
+                        self.__waiters.remove(waiter)
+                        completion.future.set_result(match)
+
+                if not self.__waiters:
+                    self.__text = self.__text[-self.MAX_BUFFER :]
+        except Exception as e:
+            # Nobody awaits the reader, so fail current and future waits instead
+            self.__error = e
+            for _, completion in self.__waiters:
+                if not completion.future.done():
+                    completion.future.set_exception(e)
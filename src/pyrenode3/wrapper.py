@@ -1,25 +1,58 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
 from functools import partial
 from importlib import import_module
 from itertools import chain
 from typing import Any, Iterable, Optional
+from weakref import WeakValueDictionary
 
+import clr
 from Antmicro.Renode.Utilities import TypeManager
 from Python.Runtime import PythonException
+from System import AppDomain, Object
+from System.Runtime.CompilerServices import RuntimeHelpers
+
+from pyrenode3 import env, proxies
 
 
 class MethodDispatcher:
-    def __init__(self, callables) -> None:
+    # Index of the callable which accepted given argument types: (key, argument types) -> index
+    __resolved = {}  # noqa: RUF012
+
+    # Number of calls rejected because of mismatched argument types, per key
+    misses = Counter()
+
+    def __init__(self, callables, key=None) -> None:
+        """Create a dispatcher calling the first of `callables` which accepts the arguments.
+
+        Parameters
+        ----------
+        callables
+            candidates, tried in order
+
+        key
+            hashable identifying the set of candidates, e.g. ``(type, name)``;
+            if given, the candidate chosen for argument types is remembered across dispatchers
+        """
         self._callables = callables
+        self._key = key
         if not self._callables or not all([callable(x) for x in callables]):
             msg = "Method dispatcher requires an iterator over callables."
             raise ValueError(msg)
 
     def __call__(self, *args, **kwargs):
+        order = range(len(self._callables))
+        signature = None
+        if self._key is not None:
+            kwtypes = tuple(sorted((k, type(v)) for k, v in kwargs.items()))
+            signature = self._key, tuple(map(type, args)), kwtypes
+            resolved = self.__resolved.get(signature)
+            if resolved is not None:
+                order = [resolved, *(i for i in order if i != resolved)]
+
         exceptions = []
-        for callable in self._callables:
+        for i in order:
             try:
-                return callable(*args, **kwargs)
+                result = self._callables[i](*args, **kwargs)
             except TypeError as e:
                 msg = "Unexpected 'TypeError' occured. This shouldn't happen unless Python.NET changes significantly."
                 try:
@@ -28,31 +61,163 @@ class MethodDispatcher:
                 except Exception:
                     raise RuntimeError(msg) from e
 
+                self.misses[self._key] += 1
                 exceptions.append(e)
                 continue
 
+            if signature is not None:
+                self.__resolved[signature] = i
+            return result
+
         raise RuntimeError(exceptions)
 
     def __repr__(self):
         return f"{self.__class__.__name__}([{', '.join(map(repr, self._callables))}])"
 
+    @classmethod
+    def clear(cls) -> None:
+        """Forget remembered candidates and reset miss counters."""
+        cls.__resolved.clear()
+        cls.misses.clear()
+
+
+class MemberIndex:
+    """Names of members of a Python.NET type, split by their kind."""
+
+    __slots__ = ("all", "fields", "methods", "properties")
+
+    # Indices of already seen types: Python.NET type -> MemberIndex
+    __indices = {}  # noqa: RUF012
+
+    def __init__(self, kls: type):
+        self.all = frozenset(dir(kls))
+
+        try:
+            clr_type = clr.GetClrType(kls)
+        except Exception:
+            clr_type = None
+
+        if clr_type is None:
+            self.properties = self.fields = self.methods = frozenset()
+            return
+
+        # Members of interfaces inherited by an interface aren't reported by reflection,
+        # so these sets might be incomplete and ``all`` is the authoritative list of members.
+        self.properties = self.all.intersection(x.Name for x in clr_type.GetProperties())
+        self.fields = self.all.intersection(x.Name for x in clr_type.GetFields())
+        self.methods = self.all.intersection(x.Name for x in clr_type.GetMethods())
+
+    @classmethod
+    def of(cls, obj) -> "MemberIndex":
+        """Get member index of the type of Python.NET object `obj`."""
+        kls = type(obj)
+        index = cls.__indices.get(kls)
+        if index is None:
+            index = cls.__indices[kls] = cls(kls)
+
+        return index
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.__indices.clear()
+
+
+class _Member:
+    """A descriptor providing a member of the wrapped .NET object."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return getattr(instance.internal, self.name)
+
+
+class _ExtensionMethod:
+    """A descriptor providing an extension method bound to the wrapped .NET object."""
+
+    __slots__ = ("function", "key", "name", "overloaded")
+
+    def __init__(self, name: str, function, key, *, overloaded: bool):
+        self.name = name
+        self.function = function
+        self.key = key
+        self.overloaded = overloaded
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        internal = instance.internal
+        extension_method = partial(self.function, internal)
+        if self.overloaded:
+            return MethodDispatcher([getattr(internal, self.name), extension_method], key=self.key)
+
+        return extension_method
+
+
+class MetaInterned(type):
+    """A metaclass making the class return the same instance for the same wrapped .NET object.
+
+    The wrapped object must be the first argument of the constructor.
+    Instances are held weakly, so they are freed once they aren't used anymore.
+    """
+
+    # (class, identity hash of the .NET object) -> instance
+    __instances = WeakValueDictionary()
+
+    def __call__(cls, internal, *args, **kwargs):
+        key = cls, RuntimeHelpers.GetHashCode(internal)
+        instance = cls.__instances.get(key)
+        if instance is not None and Object.ReferenceEquals(instance.internal, internal):
+            return instance
+
+        instance = super().__call__(internal, *args, **kwargs)
+        cls.__instances[key] = instance
+        return instance
+
 
 class Wrapper:
     """A class used for providing Python.NET objects with extension methods and helpers."""
 
+    __slots__ = ("__internal", "__weakref__")
+
+    # Extension methods of .NET types, shared by all wrappers: type -> name -> declaring classes
+    __extension_methods = {}  # noqa: RUF012
+    # Python callables of resolved extension methods: (type, name) -> callable
+    __extension_callables = {}  # noqa: RUF012
+    # Proxy classes: (wrapper class, Python.NET type, .NET type) -> proxy class
+    __proxies = {}  # noqa: RUF012
+
     def __init__(self, internal=None):
         self.__internal = internal
 
+        if internal is not None and env.pyrenode_proxies and "_Wrapper__proxy" not in type(self).__dict__:
+            # Bypass __setattr__, which would try to set the wrapped object's __class__
+            object.__setattr__(self, "__class__", self.__get_proxy_class())
+
     def __dir__(self) -> "Iterable[str]":
-        return list(set(chain(super().__dir__(), self._elements(), dir(self.internal), self._get_extension_methods())))
+        members = MemberIndex.of(self.internal).all
+        return list(set(chain(super().__dir__(), self._elements(), members, self._get_extension_methods())))
 
     def __getattr__(self, item):
-        if "_Wrapper__internal" not in self.__dict__:
+        if item == "_Wrapper__internal" or not self.__is_initialized():
             raise AttributeError
 
         callables = []
+        members = MemberIndex.of(self.internal)
 
-        if item in dir(self.internal):
+        if item in members.properties or item in members.fields:
+            return getattr(self.internal, item)
+
+        if item in members.methods:
+            callables.append(getattr(self.internal, item))
+
+        elif item in members.all:
             internal_attr = getattr(self.internal, item)
             if not callable(internal_attr):
                 return internal_attr
@@ -66,7 +231,7 @@ class Wrapper:
         if len(callables) == 1:
             return callables[0]
         elif len(callables) > 1:
-            return MethodDispatcher(callables)
+            return MethodDispatcher(callables, key=(self.internal.GetType(), item))
 
         if item in self._elements():
             return self._get(item)
@@ -74,10 +239,21 @@ class Wrapper:
         raise AttributeError
 
     def __setattr__(self, item, value):
-        if "_Wrapper__internal" in self.__dict__ and item in dir(self.internal):
+        # Slots and properties of the wrapper
+        if hasattr(getattr(type(self), item, None), "__set__"):
+            super().__setattr__(item, value)
+        elif self.__is_initialized() and item in MemberIndex.of(self.internal).all:
             setattr(self.internal, item, value)
+        else:
+            super().__setattr__(item, value)
+
+    def __is_initialized(self) -> bool:
+        try:
+            self.__internal  # noqa: B018
+        except AttributeError:
+            return False
 
-        super().__setattr__(item, value)
+        return True
 
     @property
     def internal(self):
@@ -95,16 +271,79 @@ class Wrapper:
         """Handle extra elements in ``Wrapper.__getattr__``."""
         return None
 
-    def _get_extension_methods(self) -> "dict[str, set[Any]]":
+    @classmethod
+    def invalidate_caches(cls, *_) -> None:
+        """Forget cached information about .NET types, e.g. after new extension methods were registered."""
+        Wrapper.__extension_methods.clear()
+        Wrapper.__extension_callables.clear()
+        MemberIndex.clear()
+        MethodDispatcher.clear()
+        Wrapper.__proxies.clear()
+
+    def __get_proxy_class(self) -> type:
+        """Get a subclass of the wrapper's class with descriptors for members of the wrapped object.
+
+        Members accessed through descriptors don't go through ``__getattr__``,
+        which is still used for elements and members not known up front.
+        """
+        kls = type(self)
+        key = kls, type(self.internal), self.internal.GetType()
+        proxy = self.__proxies.get(key)
+        if proxy is not None:
+            return proxy
+
+        members = MemberIndex.of(self.internal)
+        extension_methods = self._get_extension_methods()
+
+        namespace = {"__slots__": (), "__module__": kls.__module__, "_Wrapper__proxy": True}
+        for name in chain(members.all, extension_methods):
+            # Attributes defined by the wrapper take precedence, as they do without the proxy
+            if name.startswith("__") or hasattr(kls, name):
+                continue
+
+            if name in extension_methods:
+                try:
+                    function = self._find_extension_method(name)
+                except (AttributeError, RuntimeError):
+                    # Ambiguous, let __getattr__ report it
+                    continue
+                namespace[name] = _ExtensionMethod(name, function, (key[2], name), overloaded=name in members.all)
+            else:
+                namespace[name] = _Member(name)
+
+        proxy = type(kls.__name__, (kls,), namespace)
+        proxy.__qualname__ = kls.__qualname__
+        # Proxies of subclasses of pyrenode3's wrappers stay anonymous
+        if kls.__module__.startswith("pyrenode3."):
+            proxies.register(proxy, key[2])
+        self.__proxies[key] = proxy
+        return proxy
+
+    def _get_extension_methods(self) -> "dict[str, frozenset[Any]]":
+        kls = self.internal.GetType()
+        methods = self.__extension_methods.get(kls)
+        if methods is not None:
+            return methods
+
         methods = defaultdict(set)
-        for method in TypeManager.Instance.GetExtensionMethods(self.internal.GetType()):
+        for method in TypeManager.Instance.GetExtensionMethods(kls):
             dtype = method.DeclaringType
             parent = dtype.Namespace, dtype.Name
             methods[method.Name].add(parent)
 
+        methods = {name: frozenset(parents) for name, parents in methods.items()}
+        self.__extension_methods[kls] = methods
         return methods
 
     def _find_extension_method(self, name: str) -> "Optional[Any]":
+        key = self.internal.GetType(), name
+        method = self.__extension_callables.get(key)
+        if method is None:
+            method = self.__extension_callables[key] = self.__resolve_extension_method(name)
+
+        return method
+
+    def __resolve_extension_method(self, name: str) -> "Optional[Any]":
         try:
             parents = self._get_extension_methods()[name]
             if len(parents) > 1:
@@ -121,3 +360,7 @@ class Wrapper:
             return getattr(getattr(import_module(mod_name), class_name), name)
         except KeyError as e:
             raise AttributeError from e
+
+
+# Loading an assembly can make new extension methods available
+AppDomain.CurrentDomain.AssemblyLoad += Wrapper.invalidate_caches
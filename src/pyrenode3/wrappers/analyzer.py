@@ -6,6 +6,8 @@ from pyrenode3.wrapper import Wrapper
 
 
 class Analyzer(Wrapper):
+    __slots__ = ()
+
     def __init__(self, peripheral: "wrappers.Peripheral"):
         XwtInit()
         analyzer = ShowBackendAnalyzerCommand.GetAnalyzer(peripheral.internal, None)
@@ -1,24 +1,159 @@
 import itertools
-from typing import Iterable, Iterator, Optional
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 
+import clr
 from Antmicro.Renode.Core import EmulationManager, Machine
 
-from pyrenode3 import wrappers
+from pyrenode3 import registers, wrappers
 from pyrenode3.inits import EmulatorInit
 from pyrenode3.singleton import MetaSingleton
 from pyrenode3.wrapper import Wrapper
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class MachineIndex:
+    """Machines of the current emulation by name.
+
+    The index is built lazily and then kept up to date from the emulation's ``MachineAdded``
+    and ``MachineRemoved`` events; it's rebuilt when the current emulation is replaced.
+    Machines can be renamed without any event being raised, so names of entries are verified
+    only when they are used and the index is rebuilt once one of them is stale.
+    """
+
+    NAME_PREFIX = "machine"
+
+    def __init__(self):
+        self.__emulation = None
+        self.__machines = None  # name -> machine
+        self.__names = None  # machine -> name
+        # No automatically generated name below this number is free
+        self.__next_free = 0
+
+        # Keep the handlers, so the same objects are used for unsubscribing
+        self.__on_machine_added = self.__add
+        self.__on_machine_removed = self.__remove
+        self.__on_emulation_changed = self.__attach
+
+        EmulationManager.Instance.EmulationChanged += self.__on_emulation_changed
+        self.__attach()
+
+    @property
+    def machines(self) -> "dict[str, wrappers.Machine]":
+        """Get machines of the current emulation by their names."""
+        return dict(self.items())
+
+    def items(self) -> "Iterator[tuple[str, wrappers.Machine]]":
+        """Iterate over names and machines of the current emulation, verifying only the yielded entries."""
+        yielded = set()
+        for name, m in list(self.__build().items()):
+            if not self.__has_name(m, name):
+                # Entries of the rebuilt index are up to date
+                self.invalidate()
+                yield from ((n, m) for n, m in list(self.__build().items()) if n not in yielded)
+                return
+
+            yielded.add(name)
+            yield name, m
+
+    def values(self) -> "Iterator[wrappers.Machine]":
+        """Iterate over machines of the current emulation."""
+        # Machines are added and removed with events, so only their names can be stale
+        return iter(list(self.__build().values()))
+
+    def get(self, name: str) -> "Optional[wrappers.Machine]":
+        """Get a machine by its name."""
+        m = self.__build().get(name)
+        if m is not None and self.__has_name(m, name):
+            return m
+
+        # The index is stale if the machine was renamed or another machine was given the name
+        if m is None and not self.__emulation.TryGetMachineByName(name)[0]:
+            return None
+
+        self.invalidate()
+        return self.__build().get(name)
+
+    def free_names(self) -> "Iterator[str]":
+        """Get automatically generated names not used by any machine, in ascending order."""
+        for i in itertools.count(self.__next_free):
+            name = f"{self.NAME_PREFIX}{i}"
+            # Only the candidate is checked, as names in the index might be stale
+            if not self.__emulation.TryGetMachineByName(name)[0]:
+                self.__next_free = i
+                yield name
+
+    def invalidate(self) -> None:
+        """Forget known machines."""
+        self.__machines = None
+        self.__names = None
+        self.__next_free = 0
+
+    def __build(self) -> "dict[str, wrappers.Machine]":
+        if self.__machines is None:
+            emulation = self.__emulation
+            machines = {}
+            for name in emulation.Names:
+                present, m = emulation.TryGetMachineByName(name)
+                if present:
+                    machines[name] = wrappers.Machine(m)
+            self.__names = {m: name for name, m in machines.items()}
+            self.__machines = machines
+
+        return self.__machines
+
+    def __has_name(self, machine: "wrappers.Machine", name: str) -> bool:
+        present, current = self.__emulation.TryGetMachineName(machine.internal)
+        return present and current == name
+
+    def __add(self, machine) -> None:
+        if self.__machines is None:
+            return
+
+        present, name = self.__emulation.TryGetMachineName(machine)
+        if present:
+            m = wrappers.Machine(machine)
+            self.__machines[name] = m
+            self.__names[m] = name
+
+    def __remove(self, machine) -> None:
+        if self.__machines is None:
+            return
+
+        name = self.__names.pop(wrappers.Machine(machine), None)
+        if name is None:
+            return
+
+        self.__machines.pop(name, None)
+        if name.startswith(self.NAME_PREFIX) and name[len(self.NAME_PREFIX) :].isdecimal():
+            self.__next_free = min(self.__next_free, int(name[len(self.NAME_PREFIX) :]))
+
+    def __attach(self, *_) -> None:
+        if self.__emulation is not None:
+            self.__emulation.MachineAdded -= self.__on_machine_added
+            self.__emulation.MachineRemoved -= self.__on_machine_removed
+
+        self.__emulation = EmulationManager.Instance.CurrentEmulation
+        self.__emulation.MachineAdded += self.__on_machine_added
+        self.__emulation.MachineRemoved += self.__on_machine_removed
+        self.invalidate()
+
 
 class Emulation(Wrapper, metaclass=MetaSingleton):
     """Wrapper of ``Emulation``."""
 
+    __slots__ = ("__index",)
+
     def __init__(self):
         EmulatorInit()
         super().__init__()
+        self.__index = MachineIndex()
 
     def __iter__(self) -> "Iterator[wrappers.Machine]":
         """Get iterator over Emulation's machines."""
-        return (self.get_mach(name) for name in self.internal.Names)
+        return self.__index.values()
 
     def __delattr__(self, name: str) -> None:
         """Remove selected machine."""
@@ -45,7 +180,7 @@ class Emulation(Wrapper, metaclass=MetaSingleton):
         m = Machine()
 
         if name is None:
-            for name in self._generate_machine_names():
+            for name in self.__index.free_names():
                 if self.internal.TryAddMachine(m, name):
                     return wrappers.Machine(m)
 
@@ -54,26 +189,73 @@ class Emulation(Wrapper, metaclass=MetaSingleton):
 
     def get_mach(self, name: str) -> "Optional[wrappers.Machine]":
         """Find selected machine in the emulation."""
-        present, m = self.internal.TryGetMachineByName(name)
+        return self.__index.get(name)
 
-        if present:
-            return wrappers.Machine(m)
+    def get_peripheral(self, path: str) -> "Optional[wrappers.Peripheral]":
+        """Find peripheral by its full path, including the machine's name (e.g. ``hifive.sysbus.uart0``)."""
+        # Machine names may contain dots, so try every prefix of the path
+        parts = path.split(".")
+        for i in range(1, len(parts)):
+            mach = self.__index.get(".".join(parts[:i]))
+            if mach is not None and (p := mach.peripherals.get(".".join(parts[i:]))) is not None:
+                return p
+
+        return None
+
+    def find_peripherals(self, type_or_glob: "Union[str, type]") -> "dict[str, wrappers.Peripheral]":
+        """Find peripherals of all machines by type or path.
+
+        Parameters
+        ----------
+        type_or_glob : Union[str, type]
+            .NET type (or interface) the peripherals must implement, or a shell-style pattern
+            matching their full paths (e.g. ``*.sysbus.uart*``)
+
+        Returns
+        -------
+        dict[str, wrappers.Peripheral]
+            Found peripherals by their full paths
+        """
+        if isinstance(type_or_glob, str):
+
+            def matches(path, _):
+                return fnmatchcase(path, type_or_glob)
+
+        else:
+            kls = clr.GetClrType(type_or_glob)
+
+            def matches(_, p):
+                return kls.IsInstanceOfType(p.internal)
+
+        found = {}
+        for mach_name, mach in self.__index.items():
+            for path, p in mach.peripherals.all().items():
+                full_path = f"{mach_name}.{path}"
+                if matches(full_path, p):
+                    found[full_path] = p
+
+        return found
+
+    def register_snapshot(self) -> "np.ndarray":
+        """Read registers of all CPUs of all machines into a structured NumPy array.
+
+        See :func:`pyrenode3.registers.snapshot` for the array's layout.
+        """
+        return registers.snapshot(self.__index.machines)
+
+    def set_registers(self, snapshot: "np.ndarray") -> None:
+        """Set registers of CPUs of all machines to values from a snapshot created by :meth:`register_snapshot`."""
+        registers.restore(snapshot, self.__index.machines)
 
     def rem_mach(self, name: str) -> bool:
         """Remove selected machine from the emulation."""
         return self.internal.TryRemoveMachine(name)
 
     def _elements(self) -> "Iterable[str]":
-        return list(self.internal.Names)
+        return [name for name, _ in self.__index.items()]
 
     def _get(self, item: str):
         if (mach := self.get_mach(item)) is not None:
             return mach
 
         raise AttributeError
-
-    @classmethod
-    def _generate_machine_names(cls) -> "Iterator[str]":
-        for i in itertools.count():
-            name = f"machine{i}"
-            yield name
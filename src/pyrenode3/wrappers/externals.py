@@ -3,7 +3,7 @@ from typing import Iterable, Iterator, Optional
 from Antmicro.Renode.Core import IExternal
 
 from pyrenode3 import wrappers
-from pyrenode3.conversion import interface_to_class
+from pyrenode3.conversion import interface_to_class, interfaces_to_classes
 from pyrenode3.singleton import MetaSingleton
 from pyrenode3.wrapper import Wrapper
 
@@ -11,12 +11,14 @@ from pyrenode3.wrapper import Wrapper
 class ExternalsManager(Wrapper, metaclass=MetaSingleton):
     """Wrapper of ``Emulation``'s ``ExternalsManager``."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def __iter__(self) -> "Iterator[IExternal]":
         """Get iterator over ExternalManager's externals."""
-        return (interface_to_class(x) for x in self.internal.Externals)
+        return iter(interfaces_to_classes(self.internal.Externals))
 
     @property
     def internal(self):
@@ -6,6 +6,8 @@ from pyrenode3.wrapper import Wrapper
 
 
 class LEDTester(Wrapper):
+    __slots__ = ("__led_tester",)
+
     def __init__(self, emulation: "wrappers.Emulation", peripheral: "wrappers.Peripheral", name: str, defaultTimeout: float = 0):
         self.__led_tester = Testing.LEDTester(peripheral.internal, (defaultTimeout))
         super().__init__(self.__led_tester)
@@ -1,17 +1,56 @@
+import ctypes
+import json
+import pathlib
+from typing import TYPE_CHECKING, Any, Iterable, List, NamedTuple, Optional, Tuple, Union
+
 from Antmicro.Renode import Core
 from Antmicro.Renode.Core.Extensions import FileLoaderExtensions
+from Antmicro.Renode.Peripherals.Memory import IMemory
 from Antmicro.Renode.PlatformDescription.UserInterface import PlatformDescriptionMachineExtensions
 
-from pyrenode3 import wrappers
+from pyrenode3 import checkpoints, registers, wrappers
+from pyrenode3.conversion import as_memoryview, as_numpy, copy_to, to_array
+from pyrenode3.ranges import read_ranges
 from pyrenode3.rpath import RPath
-from pyrenode3.wrapper import Wrapper
+from pyrenode3.wrapper import MetaInterned, Wrapper
+from pyrenode3.wrappers.peripheral import PeripheralIndex
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class MemoryRegion(NamedTuple):
+    """A memory peripheral registered on the system bus."""
+
+    path: str
+    peripheral: "wrappers.Peripheral"
+    address: int
+    size: int
 
 
-class Machine(Wrapper):
+class Machine(Wrapper, metaclass=MetaInterned):
     """Wrapper of ``Machine``."""
 
+    __slots__ = ("__peripherals",)
+
     def __init__(self, machine: "Core.Machine"):
         super().__init__(machine)
+        self.__peripherals = None
+
+    @property
+    def peripherals(self) -> "PeripheralIndex":
+        """Get index of machine's peripherals, kept up to date as peripherals are (un)registered."""
+        if self.__peripherals is None:
+            self.__peripherals = PeripheralIndex(self)
+
+        return self.__peripherals
+
+    @property
+    def name(self) -> "Optional[str]":
+        """Get machine's name in the emulation."""
+        present, name = wrappers.Emulation().internal.TryGetMachineName(self.internal)
+        if present:
+            return name
 
     @property
     def sysbus(self) -> "wrappers.Peripheral":
@@ -54,3 +93,192 @@ class Machine(Wrapper):
             load point
         """
         FileLoaderExtensions.LoadBinary(self.sysbus.internal, RPath(location).read_file_path, load_point)
+
+    def read_memory(self, address: int, length: "Optional[int]" = None, out=None, dtype=None) -> Any:
+        """Read a contiguous range of the system bus with a single call.
+
+        Parameters
+        ----------
+        address : int
+            address of the first byte
+
+        length : Optional[int]
+            number of bytes to read; defaults to the size of `out`
+
+        out
+            writable C-contiguous buffer (e.g. ``bytearray`` or a NumPy array) to fill instead of
+            returning a new object
+
+        dtype
+            NumPy data type; if given, a NumPy array of such elements is returned
+
+        Returns
+        -------
+        Any
+            ``bytes``, `out` or a NumPy array
+        """
+        if out is not None:
+            length = memoryview(out).nbytes if length is None else length
+        elif length is None:
+            msg = "Either 'length' or 'out' has to be given."
+            raise ValueError(msg)
+
+        data = self.sysbus.internal.ReadBytes(address, length)
+
+        if out is not None:
+            copy_to(data, out)
+            return out
+        if dtype is not None:
+            return as_numpy(data).view(dtype)
+        return as_memoryview(data).tobytes()
+
+    def write_memory(self, address: int, buffer) -> None:
+        """Write content of any C-contiguous buffer (e.g. ``bytes`` or a NumPy array) to the system bus at once."""
+        self.sysbus.internal.WriteBytes(to_array(buffer, "System.Byte"), address)
+
+    def read_memory_ranges(self, ranges: "Iterable[Tuple[int, int]]") -> "List[bytes]":
+        """Read many ranges of the system bus.
+
+        Adjacent and overlapping ranges are read together, with one call per contiguous block.
+
+        Parameters
+        ----------
+        ranges : Iterable[Tuple[int, int]]
+            pairs of address and length
+
+        Returns
+        -------
+        List[bytes]
+            Content of the ranges, in the order they were given
+        """
+        return read_ranges(self.read_memory, ranges)
+
+    def write_memory_ranges(self, ranges: "Iterable[Tuple[int, Any]]") -> None:
+        """Write many buffers to the system bus, with one call per buffer.
+
+        Parameters
+        ----------
+        ranges : Iterable[Tuple[int, Any]]
+            pairs of address and C-contiguous buffer
+        """
+        for address, buffer in ranges:
+            self.write_memory(address, buffer)
+
+    def memory_regions(self) -> "List[MemoryRegion]":
+        """Get memory peripherals registered on the system bus, sorted by address.
+
+        A memory registered at many addresses is listed once per registration.
+        """
+        sysbus = self.sysbus.internal
+        regions = []
+        for path, p in self.peripherals.all().items():
+            if not isinstance(p.internal, IMemory):
+                continue
+
+            for registration in sysbus.GetRegistrationPoints(p.internal):
+                regions.append(MemoryRegion(path, p, int(registration.Range.StartAddress), int(p.internal.Size)))
+
+        return sorted(regions, key=lambda x: x.address)
+
+    def export_memory(
+        self,
+        output_dir: "Union[str, pathlib.Path]",
+        regions: "Optional[Iterable[MemoryRegion]]" = None,
+        chunk_size: int = 16 << 20,
+    ) -> "pathlib.Path":
+        """Write content of memory regions to raw files which can be mapped with ``numpy.memmap`` or ``mmap``.
+
+        Regions are read in chunks of `chunk_size` bytes, so they are never held in memory as a whole.
+        Every region is written to ``<address>.bin`` and described in ``regions.json``.
+
+        Parameters
+        ----------
+        output_dir : Union[str, pathlib.Path]
+            directory to write files to
+
+        regions : Optional[Iterable[MemoryRegion]]
+            regions to export, all of them by default
+
+        chunk_size : int
+            number of bytes read at once
+
+        Returns
+        -------
+        pathlib.Path
+            Path of ``regions.json``
+        """
+        output_dir = pathlib.Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        sysbus = self.sysbus.internal
+
+        index = []
+        for region in self.memory_regions() if regions is None else regions:
+            name = f"{region.address:#x}.bin"
+            with open(output_dir / name, "wb") as f:
+                for offset in range(0, region.size, chunk_size):
+                    length = min(chunk_size, region.size - offset)
+                    f.write(as_memoryview(sysbus.ReadBytes(region.address + offset, length)))
+
+            index.append({"path": region.path, "address": region.address, "size": region.size, "file": name})
+
+        path = output_dir / "regions.json"
+        path.write_text(json.dumps(index, indent=2))
+        return path
+
+    def memory_view(self, region: "MemoryRegion") -> "List[Tuple[int, memoryview]]":
+        """Get read-only views of host memory backing a memory region, without copying it.
+
+        Only memories exposing their host memory (e.g. ``MappedMemory``) are supported. Such memory
+        is allocated in segments, so a view is returned for each of them. The views reflect
+        the current content of the memory; they mustn't be used after the memory is disposed,
+        e.g. after the machine is removed.
+
+        Returns
+        -------
+        List[Tuple[int, memoryview]]
+            Pairs of a segment's offset in the region and its view
+        """
+        segments = getattr(region.peripheral.internal, "MappedSegments", None)
+        if segments is None:
+            msg = f"{region.path} doesn't expose its host memory."
+            raise TypeError(msg)
+
+        views = []
+        for segment in segments:
+            buffer = (ctypes.c_uint8 * int(segment.Size)).from_address(segment.Pointer.ToInt64())
+            views.append((int(segment.StartingOffset), memoryview(buffer).toreadonly()))
+
+        return sorted(views, key=lambda x: x[0])
+
+    def register_snapshot(self) -> "np.ndarray":
+        """Read registers of all machine's CPUs into a structured NumPy array.
+
+        See :func:`pyrenode3.registers.snapshot` for the array's layout.
+        """
+        name = self.name
+        if name is None:
+            msg = "The machine isn't added to the emulation, so it has no name to put in the snapshot."
+            raise RuntimeError(msg)
+
+        return registers.snapshot({name: self})
+
+    def set_registers(self, snapshot: "np.ndarray") -> None:
+        """Set registers of machine's CPUs to values from a snapshot created by :meth:`register_snapshot`.
+
+        The snapshot is restored even if the machine was renamed since it was created.
+        """
+        names = {str(x) for x in snapshot["machine"]}
+        if len(names) > 1:
+            msg = f"The snapshot holds registers of machines {', '.join(sorted(names))}, restore it with Emulation."
+            raise ValueError(msg)
+
+        registers.restore(snapshot, dict.fromkeys(names, self))
+
+    def checkpoints(
+        self, directory: "Union[str, pathlib.Path]", page_size: int = checkpoints.DEFAULT_PAGE_SIZE
+    ) -> "checkpoints.CheckpointChain":
+        """Open the chain of incremental checkpoints of the machine stored in `directory` or start a new one there.
+
+        See :class:`pyrenode3.checkpoints.CheckpointChain` for details.
+        """
+        return checkpoints.CheckpointChain(self, directory, page_size)
@@ -4,6 +4,7 @@ from Antmicro.Renode.Core import ObjectCreator
 from pyrenode3 import RenodeLoader
 from pyrenode3.conversion import interface_to_class
 from pyrenode3.inits import EmulatorInit
+from pyrenode3.profiling import StartupProfiler
 from pyrenode3.singleton import MetaSingleton
 from pyrenode3.wrapper import Wrapper
 
@@ -11,8 +12,10 @@ from pyrenode3.wrapper import Wrapper
 class Monitor(Wrapper, metaclass=MetaSingleton):
     """Wrapper of ``Monitor``."""
 
+    __slots__ = ()
+
     def __init__(self):
-        with RenodeLoader().in_root():
+        with RenodeLoader().in_root(), StartupProfiler().phase("Monitor"):
             EmulatorInit()
 
             context = ObjectCreator.Instance.OpenContext()
@@ -1,17 +1,125 @@
+import weakref
 from typing import Iterator, Optional
 
 from Antmicro.Renode.Peripherals import IPeripheral, IPeripheralExtensions
 
 from pyrenode3 import wrappers
-from pyrenode3.conversion import interface_to_class
-from pyrenode3.wrapper import Wrapper
+from pyrenode3.conversion import interface_to_class, interfaces_to_classes
+from pyrenode3.wrapper import MetaInterned, Wrapper
 
 
-class Peripheral(Wrapper):
+class PeripheralIndex:
+    """Names, paths and children of peripherals of a single machine.
+
+    The index is filled lazily and dropped whenever the machine reports that its peripherals
+    changed, so repeated lookups don't query the machine.
+    """
+
+    __slots__ = ("__all", "__children", "__full_names", "__machine", "__names", "__paths", "__weakref__")
+
+    def __init__(self, machine: "wrappers.Machine"):
+        self.__machine = machine.internal
+        self.invalidate()
+
+        # The handler mustn't keep the index alive, it's unsubscribed once the index is freed
+        ref = weakref.ref(self)
+
+        def invalidate(*_):
+            if (index := ref()) is not None:
+                index.invalidate()
+
+        self.__machine.PeripheralsChanged += invalidate
+        weakref.finalize(self, PeripheralIndex.__unsubscribe, self.__machine, invalidate).atexit = False
+
+    def invalidate(self) -> None:
+        """Forget everything known about the machine's peripherals."""
+        # Replace instead of clearing, so lookups in progress don't store stale entries in the new index
+        self.__children = {}  # parent -> name -> child
+        self.__names = {}  # peripheral -> local name
+        self.__full_names = {}  # peripheral -> path
+        self.__paths = {}  # path -> peripheral
+        self.__all = None
+
+    def children(self, parent: "Peripheral") -> "dict[str, Peripheral]":
+        """Get named children of `parent`."""
+        cache = self.__children
+        children = cache.get(parent)
+        if children is None:
+            children = {}
+            for child in interfaces_to_classes(self.__machine.GetChildrenPeripherals(parent.internal)):
+                p = Peripheral(child)
+                if (name := self.name(p)) is not None:
+                    children[name] = p
+            cache[parent] = children
+
+        return children
+
+    def name(self, peripheral: "Peripheral") -> "Optional[str]":
+        """Get local name of `peripheral`."""
+        cache = self.__names
+        if peripheral not in cache:
+            present, name = self.__machine.TryGetLocalName(peripheral.internal)
+            cache[peripheral] = name if present else None
+
+        return cache[peripheral]
+
+    def path(self, peripheral: "Peripheral") -> "Optional[str]":
+        """Get full path of `peripheral` (e.g. ``sysbus.uart0``)."""
+        cache = self.__full_names
+        if peripheral not in cache:
+            present, name = self.__machine.TryGetAnyName(peripheral.internal)
+            cache[peripheral] = name if present else None
+
+        return cache[peripheral]
+
+    def get(self, path: str) -> "Optional[Peripheral]":
+        """Get peripheral by its full path (e.g. ``sysbus.uart0``)."""
+        cache = self.__paths
+        peripheral = cache.get(path)
+        if peripheral is not None:
+            return peripheral
+
+        root, *names = path.split(".")
+        peripheral = Peripheral(self.__machine.SystemBus)
+        if self.name(peripheral) != root:
+            return None
+
+        for name in names:
+            peripheral = self.children(peripheral).get(name)
+            if peripheral is None:
+                return None
+
+        cache[path] = peripheral
+        return peripheral
+
+    def all(self) -> "dict[str, Peripheral]":
+        """Get all named peripherals of the machine by their paths."""
+        found = self.__all
+        if found is None:
+            sysbus = Peripheral(self.__machine.SystemBus)
+            found = {}
+            pending = [(self.name(sysbus), sysbus)]
+            while pending:
+                path, peripheral = pending.pop()
+                found[path] = peripheral
+                pending.extend((f"{path}.{name}", child) for name, child in self.children(peripheral).items())
+            self.__all = found
+
+        return found
+
+    @staticmethod
+    def __unsubscribe(machine, handler) -> None:
+        machine.PeripheralsChanged -= handler
+
+
+class Peripheral(Wrapper, metaclass=MetaInterned):
     """Wrapper of ``IPeripheral`` and its derivatives."""
 
+    __slots__ = ("__mach",)
+
     def __init__(self, peripheral: "IPeripheral"):
         super().__init__(interface_to_class(peripheral))
+        self.__mach = None
 
     def __iter__(self) -> "Iterator[Peripheral]":
         """Get iterator over peripheral's children."""
@@ -20,21 +128,21 @@ class Peripheral(Wrapper):
     @property
     def name(self) -> Optional[str]:
         """Get peripheral's name."""
-        present, name = self.mach.TryGetLocalName(self.internal)
-        if present:
-            return name
+        return self.mach.peripherals.name(self)
 
     @property
     def path(self) -> str:
         """Get peripheral's path (e.g. ``sysbus.uart0``)."""
-        _, name = self.mach.TryGetAnyName(self.internal)
-        return name
+        return self.mach.peripherals.path(self)
 
     @property
     def mach(self) -> "wrappers.Machine":
         """Get peripheral's parent :class:`Mach <Mach>`."""
-        m = IPeripheralExtensions.GetMachine(self.internal)
-        return wrappers.Machine(m)
+        if self.__mach is None:
+            m = IPeripheralExtensions.GetMachine(self.internal)
+            self.__mach = wrappers.Machine(m)
+
+        return self.__mach
 
     def get_child(self, name: str):
         """Get peripheral's child peripheral."""
@@ -48,5 +156,4 @@ class Peripheral(Wrapper):
 
     @property
     def __children(self) -> "dict[str, Peripheral]":
-        ps = (Peripheral(x) for x in self.mach.internal.GetChildrenPeripherals(self.internal))
-        return {p.name: p for p in ps if p.name is not None}
+        return self.mach.peripherals.children(self)
@@ -6,6 +6,8 @@ from pyrenode3.wrapper import Wrapper
 
 
 class TerminalTester(Wrapper):
+    __slots__ = ("__term_tester",)
+
     def __init__(self, peripheral: "wrappers.Peripheral", timeout: float, *args, **kwargs):
         self.__term_tester = Testing.TerminalTester(self.to_interval(timeout), *args, **kwargs)
         super().__init__(self.__term_tester)
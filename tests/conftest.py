@@ -0,0 +1,15 @@
+import os
+
+# Tests cover the parts of pyrenode3 which don't need Renode
+os.environ.setdefault("PYRENODE_SKIP_LOAD", "1")
+
+from pyrenode3 import env
+
+# Tests of modules using .NET types run only if the runtime can be loaded
+collect_ignore = []
+try:
+    import pythonnet
+
+    pythonnet.load(env.pyrenode_runtime)
+except Exception:
+    collect_ignore.append("test_conversion.py")
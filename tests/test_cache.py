@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+from pyrenode3 import cache, env
+
+
+@pytest.fixture()
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(env, "pyrenode_cache_dir", str(tmp_path))
+    monkeypatch.setattr(cache, "_leases", {})
+    yield tmp_path
+    for f in cache._leases.values():
+        f.close()
+
+
+def make_entry(cache_dir, name, size, mtime):
+    entry = cache_dir / "packages" / name
+    entry.mkdir(parents=True)
+    (entry / cache.METADATA_FILE).write_text(json.dumps({"size": size}))
+    os.utime(entry, (mtime, mtime))
+    return entry
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (1234, 1234),
+        ("1234", 1234),
+        ("512K", 512 << 10),
+        ("512kb", 512 << 10),
+        (" 2G ", 2 << 30),
+        ("1.5M", 3 << 19),
+        ("1T", 1 << 40),
+        ("0", 0),
+    ],
+)
+def test_parse_size(value, expected):
+    assert cache.parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "G", "2X", "two"])
+def test_parse_size_invalid(value):
+    with pytest.raises(ValueError, match="Invalid size"):
+        cache.parse_size(value)
+
+
+def test_evict_removes_least_recently_used(cache_dir):
+    oldest = make_entry(cache_dir, "a", 100, 1000)
+    newest = make_entry(cache_dir, "b", 100, 3000)
+    older = make_entry(cache_dir, "c", 100, 2000)
+
+    cache.evict(150)
+
+    assert not oldest.exists()
+    assert not older.exists()
+    assert newest.exists()
+
+
+def test_evict_stops_once_under_limit(cache_dir):
+    oldest = make_entry(cache_dir, "a", 100, 1000)
+    newer = make_entry(cache_dir, "b", 100, 2000)
+
+    cache.evict(100)
+
+    assert not oldest.exists()
+    assert newer.exists()
+
+
+def test_evict_keeps_given_entries(cache_dir):
+    oldest = make_entry(cache_dir, "a", 100, 1000)
+    newer = make_entry(cache_dir, "b", 100, 2000)
+
+    cache.evict(100, keep=[oldest])
+
+    assert oldest.exists()
+    assert not newer.exists()
+
+
+def test_evict_disabled(cache_dir):
+    entry = make_entry(cache_dir, "a", 100, 1000)
+
+    cache.evict(0)
+
+    assert entry.exists()
+
+
+def test_evict_skips_extractions_in_progress(cache_dir):
+    extracting = make_entry(cache_dir, ".a.tmp", 100, 1000)
+    newer = make_entry(cache_dir, "b", 100, 2000)
+
+    cache.evict(100)
+
+    assert extracting.exists()
+    assert newer.exists()
+
+
+@pytest.mark.skipif(cache.fcntl is None, reason="leases need fcntl")
+def test_evict_skips_leased_entries(cache_dir):
+    oldest = make_entry(cache_dir, "a", 100, 1000)
+    newer = make_entry(cache_dir, "b", 100, 2000)
+    cache.lease(oldest / "opt" / "renode")
+
+    cache.evict(100)
+
+    assert oldest.exists()
+    assert not newer.exists()
+
+
+@pytest.mark.usefixtures("cache_dir")
+def test_lease_ignores_paths_outside_cache(tmp_path_factory):
+    cache.lease(tmp_path_factory.mktemp("renode"))
+
+    assert cache._leases == {}
@@ -0,0 +1,150 @@
+from typing import NamedTuple
+
+import pytest
+
+from pyrenode3.checkpoints import CheckpointChain
+
+np = pytest.importorskip("numpy")
+
+PAGE_SIZE = 256
+BASE = 0x8000_0000
+
+
+class Region(NamedTuple):
+    path: str
+    peripheral: object
+    address: int
+    size: int
+
+
+class FakeMachine:
+    """A machine with a single memory region and one register."""
+
+    def __init__(self, size, *, host_memory=False):
+        self.memory = bytearray(i % 251 for i in range(size))
+        self.register = 0
+        self.writes = []
+        self.host_memory = host_memory
+        self.region = Region("sysbus.mem", object(), BASE, size)
+
+    def memory_regions(self):
+        return [self.region, self.region._replace(address=BASE + 0x1000_0000)]
+
+    def memory_view(self, _):
+        if not self.host_memory:
+            raise TypeError
+        return [(0, memoryview(self.memory))]
+
+    def read_memory(self, address, length):
+        return bytes(self.memory[address - BASE : address - BASE + length])
+
+    def write_memory(self, address, data):
+        self.writes.append((address - BASE, len(data)))
+        self.memory[address - BASE : address - BASE + len(data)] = data
+
+    def register_snapshot(self):
+        return np.array([self.register], dtype="u8")
+
+    def set_registers(self, snapshot):
+        self.register = int(snapshot[0])
+
+    def touch(self, page, offset=0):
+        self.memory[page * PAGE_SIZE + offset] ^= 0xFF
+
+
+@pytest.mark.parametrize("host_memory", [False, True])
+def test_restore(tmp_path, host_memory):
+    machine = FakeMachine(16 * PAGE_SIZE, host_memory=host_memory)
+    chain = CheckpointChain(machine, tmp_path, PAGE_SIZE)
+    original = bytes(machine.memory)
+    assert chain.checkpoint() == 0
+
+    for page in (1, 2, 3, 7):
+        machine.touch(page)
+    machine.register = 5
+    assert chain.checkpoint() == 1
+    modified = bytes(machine.memory)
+
+    machine.touch(9)
+    chain.restore(0)
+
+    assert machine.memory == original
+    assert machine.register == 0
+    # Consecutive pages are written at once
+    assert machine.writes == [(1 * PAGE_SIZE, 3 * PAGE_SIZE), (7 * PAGE_SIZE, PAGE_SIZE), (9 * PAGE_SIZE, PAGE_SIZE)]
+    assert len(chain) == 1
+
+    machine.memory[:] = modified
+    machine.writes.clear()
+    chain.restore(0)
+    assert machine.memory == original
+
+
+def test_deltas_hold_changed_pages(tmp_path):
+    machine = FakeMachine(16 * PAGE_SIZE)
+    chain = CheckpointChain(machine, tmp_path, PAGE_SIZE)
+    chain.checkpoint()
+    machine.touch(4)
+    chain.checkpoint()
+
+    assert (tmp_path / "checkpoint-000000.pages").stat().st_size == 16 * PAGE_SIZE
+    assert (tmp_path / "checkpoint-000001.pages").stat().st_size == PAGE_SIZE
+
+
+def test_partial_last_page(tmp_path):
+    size = 4 * PAGE_SIZE + PAGE_SIZE // 2
+    machine = FakeMachine(size)
+    chain = CheckpointChain(machine, tmp_path, PAGE_SIZE)
+    chain.checkpoint()
+    original = bytes(machine.memory)
+
+    machine.touch(4, offset=PAGE_SIZE // 2 - 1)
+    chain.restore(0)
+
+    assert machine.memory == original
+    assert machine.writes == [(4 * PAGE_SIZE, PAGE_SIZE // 2)]
+
+
+def test_reopen(tmp_path):
+    machine = FakeMachine(8 * PAGE_SIZE)
+    chain = CheckpointChain(machine, tmp_path, PAGE_SIZE)
+    chain.checkpoint()
+    original = bytes(machine.memory)
+    machine.touch(2)
+    chain.checkpoint()
+
+    machine.touch(5)
+    reopened = CheckpointChain(machine, tmp_path, PAGE_SIZE)
+    assert len(reopened) == 2
+
+    reopened.restore(0)
+
+    assert machine.memory == original
+    assert machine.writes == [(2 * PAGE_SIZE, PAGE_SIZE), (5 * PAGE_SIZE, PAGE_SIZE)]
+    assert len(CheckpointChain(machine, tmp_path, PAGE_SIZE)) == 1
+
+
+def test_reopen_with_other_page_size(tmp_path):
+    machine = FakeMachine(8 * PAGE_SIZE)
+    CheckpointChain(machine, tmp_path, PAGE_SIZE).checkpoint()
+
+    with pytest.raises(ValueError, match="pages of 256 bytes"):
+        CheckpointChain(machine, tmp_path, 2 * PAGE_SIZE)
+
+
+def test_restore_missing_checkpoint(tmp_path):
+    chain = CheckpointChain(FakeMachine(PAGE_SIZE), tmp_path, PAGE_SIZE)
+
+    with pytest.raises(IndexError):
+        chain.restore(0)
+
+
+def test_restore_warns_about_peripherals_once(tmp_path, caplog):
+    chain = CheckpointChain(FakeMachine(PAGE_SIZE), tmp_path, PAGE_SIZE)
+    chain.checkpoint()
+
+    chain.restore(0)
+    chain.restore(0)
+
+    assert [r.levelname for r in caplog.records] == ["WARNING"]
+    assert "other peripherals" in caplog.text
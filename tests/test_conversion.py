@@ -0,0 +1,114 @@
+import array
+import ctypes
+
+import pytest
+from System import Array, Byte, Int32, UInt64
+
+from pyrenode3.conversion import as_memoryview, as_numpy, copy_to, to_array
+
+
+@pytest.mark.parametrize(
+    ("typecode", "element_type"),
+    [
+        ("b", "System.SByte"),
+        ("B", "System.Byte"),
+        ("h", "System.Int16"),
+        ("H", "System.UInt16"),
+        ("i", "System.Int32"),
+        ("I", "System.UInt32"),
+        ("q", "System.Int64"),
+        ("Q", "System.UInt64"),
+        ("f", "System.Single"),
+        ("d", "System.Double"),
+    ],
+)
+def test_to_array_element_type(typecode, element_type):
+    values = array.array(typecode, [1, 2, 3])
+
+    result = to_array(values)
+
+    assert result.GetType().GetElementType().FullName == element_type
+    assert list(result) == list(values)
+
+
+@pytest.mark.parametrize("typecode", ["l", "L"])
+def test_to_array_maps_long_by_size(typecode):
+    values = array.array(typecode, [1, 2, 3])
+    signed = "" if typecode.islower() else "U"
+
+    result = to_array(values)
+
+    assert result.GetType().GetElementType().FullName == f"System.{signed}Int{values.itemsize * 8}"
+    assert list(result) == [1, 2, 3]
+
+
+@pytest.mark.parametrize(("dtype", "element_type"), [("int64", "System.Int64"), ("uint64", "System.UInt64")])
+def test_to_array_numpy(dtype, element_type):
+    np = pytest.importorskip("numpy")
+    values = np.arange(4, dtype=dtype)
+
+    result = to_array(values)
+
+    assert result.GetType().GetElementType().FullName == element_type
+    assert list(result) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize(("ctype", "element_type"), [(ctypes.c_int64, "System.Int64"), (ctypes.c_uint8, "System.Byte")])
+def test_to_array_ctypes(ctype, element_type):
+    # ctypes uses formats with a byte order character, e.g. '<l' for 64-bit integers on Linux
+    values = (ctype * 3)(1, 2, 3)
+
+    result = to_array(values)
+
+    assert result.GetType().GetElementType().FullName == element_type
+    assert list(result) == [1, 2, 3]
+
+
+def test_to_array_element_type_override():
+    result = to_array(bytes(range(8)), UInt64)
+
+    assert result.GetType().GetElementType().FullName == "System.UInt64"
+    assert result[0] == 0x0706050403020100
+
+
+def test_to_array_unsupported_format():
+    with pytest.raises(TypeError, match="can't be converted"):
+        to_array(memoryview(b"abcd").cast("c"))
+
+
+def test_as_memoryview_shares_memory():
+    net = Array[Int32]([1, 2, 3])
+
+    view = as_memoryview(net)
+    view[1] = 5
+
+    assert net[1] == 5
+
+
+def test_as_numpy_shape():
+    pytest.importorskip("numpy")
+    net = Array.CreateInstance(Byte, 2, 3)
+
+    assert as_numpy(net).shape == (2, 3)
+
+
+def test_copy_to_bytearray():
+    out = bytearray(6)
+
+    copy_to(Array[Byte](bytes(range(1, 5))), out)
+
+    assert out == bytearray([1, 2, 3, 4, 0, 0])
+
+
+def test_copy_to_numpy():
+    np = pytest.importorskip("numpy")
+    out = np.zeros(2, dtype=np.uint32)
+
+    copy_to(Array[Byte](bytes([1, 0, 0, 0, 2, 0, 0, 0])), out)
+
+    assert out.tolist() == [1, 2]
+
+
+def test_copy_to_too_small_buffer():
+    with pytest.raises(ValueError, match="4 are needed"):
+        copy_to(Array[Byte](bytes(4)), bytearray(2))
@@ -0,0 +1,32 @@
+from pyrenode3.ranges import merge_ranges, read_ranges
+
+MEMORY = bytes(range(256))
+
+
+def test_merge_ranges():
+    ranges = [(0x20, 0x10), (0x00, 0x10), (0x10, 0x08), (0x40, 0x04), (0x42, 0x01), (0x30, 0x00)]
+
+    assert merge_ranges(ranges) == [(0x00, 0x18), (0x20, 0x10), (0x40, 0x04)]
+
+
+def test_merge_ranges_overlapping():
+    assert merge_ranges([(0, 16), (4, 4), (8, 16)]) == [(0, 24)]
+
+
+def test_merge_ranges_empty():
+    assert merge_ranges([]) == []
+
+
+def test_read_ranges():
+    calls = []
+
+    def read(address, length):
+        calls.append((address, length))
+        return MEMORY[address : address + length]
+
+    ranges = [(0x30, 4), (0x10, 8), (0x14, 8), (0x80, 1), (0x18, 2)]
+
+    result = read_ranges(read, iter(ranges))
+
+    assert result == [MEMORY[address : address + length] for address, length in ranges]
+    assert calls == [(0x10, 12), (0x30, 4), (0x80, 1)]